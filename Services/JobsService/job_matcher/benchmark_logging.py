@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Benchmark of the logging overhead per job match request
+Compares the old output (unbuffered prints + verbose crews rendering every prompt and
+completion) with production logging (queued records, quiet crews, sampled payloads)
+
+Run: python benchmark_logging.py [--requests 200]
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+os.environ["LOG_MODE"] = "production"
+
+from rich.console import Console
+from rich.panel import Panel
+
+from job_matcher import logging_config
+from job_matcher.logging_config import configure_logging, log_context, log_payload, shutdown_logging
+
+WORDS = "python kubernetes backend api scalable team experience cloud data service design".split()
+
+
+def _text(chars: int) -> str:
+    words = []
+    while sum(len(word) + 1 for word in words) < chars:
+        words.append(random.choice(WORDS))
+    return " ".join(words)
+
+
+# Typical sizes: scraped page, extraction prompt/completion, matching prompt/completion
+SCRAPED = _text(30_000)
+CALLS = [(_text(32_000), _text(2_000)), (_text(8_000), _text(2_500))]
+
+
+def legacy_request(out, console: Console):
+    """What one request wrote before: banners, a content preview and verbose crew output"""
+    print("\n" + "=" * 60, file=out)
+    print("🔍 Pre-scraping job with Firecrawl: https://example.com/job", file=out)
+    print("=" * 60, file=out)
+    print("📡 Calling Firecrawl API...", file=out)
+    print(f"✅ Scraped {len(SCRAPED)} characters", file=out)
+    print(f"📄 Preview: {SCRAPED[:300]}...", file=out)
+    for prompt, completion in CALLS:
+        # verbose=True agents render the full prompt and completion
+        console.print(Panel(prompt, title="🤖 Agent Started"))
+        console.print(Panel(completion, title="✅ Agent Final Answer"))
+    for line in ("✅ Extracted job: Backend", "🏢 Company: X", "📍 Location: Remote",
+                 "🎯 Analyzing CV-Job match...", "⏱️  Matching took 3.20 seconds", "✅ Match Score: 80/100"):
+        print(line, file=out)
+
+
+def production_request(logger: logging.Logger):
+    """The same request with production logging"""
+    with log_context(request_id="bench"):
+        logger.info("🔍 Pre-scraping job with Firecrawl: https://example.com/job")
+        logger.info("📡 Calling Firecrawl API...")
+        logger.info(f"✅ Scraped {len(SCRAPED)} characters")
+        log_payload(logger, "Scraped content", SCRAPED)
+        for line in ("✅ Extracted job: Backend at X (Remote)", "🎯 Analyzing CV-Job match...",
+                     "⏱️  Matching took 3.20 seconds", "✅ Match Score: 80/100"):
+            logger.info(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Line-buffered, close to the unbuffered stdout of the Docker image (PYTHONUNBUFFERED=1)
+        legacy_path = os.path.join(tmp, "legacy.log")
+        with open(legacy_path, "w", buffering=1, encoding="utf-8") as out:
+            console = Console(file=out, force_terminal=True, width=120)
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                legacy_request(out, console)
+            legacy_seconds = time.perf_counter() - start
+        legacy_bytes = os.path.getsize(legacy_path)
+
+        production_path = os.path.join(tmp, "production.log")
+        with open(production_path, "w", buffering=1, encoding="utf-8") as out:
+            configure_logging(stream=out)
+            logger = logging.getLogger("job_matcher.benchmark")
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                production_request(logger)
+            production_seconds = time.perf_counter() - start
+            shutdown_logging()  # Writer thread drains the queue off the request path
+        production_bytes = os.path.getsize(production_path)
+
+    print(f"Requests: {args.requests} (payload sample rate {logging_config.LOG_PAYLOAD_SAMPLE_RATE})")
+    for name, seconds, size in (
+        ("legacy", legacy_seconds, legacy_bytes),
+        ("production", production_seconds, production_bytes),
+    ):
+        print(
+            f"{name:>10}: {seconds / args.requests * 1000:8.3f} ms/request on the request thread, "
+            f"{size / args.requests / 1024:8.1f} KiB/request written"
+        )
+    print(f"Speedup: {legacy_seconds / production_seconds:.0f}x, output reduced {legacy_bytes / production_bytes:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,23 +4,37 @@ This provides REST API endpoints for the job matching microservice
 """
 
 import os
+import time
+import base64
+import heapq
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, status
+from fastapi import FastAPI, Header, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from pydantic import BaseModel, Field, HttpUrl
 import httpx
 
+from job_matcher.checkpoint import call_with_retries, get_checkpoint_store
+from job_matcher.http_cache import (
+    TERMINAL_STATUSES,
+    cache_headers,
+    choose_encoding,
+    is_not_modified,
+    response_cache
+)
+from job_matcher.logging_config import configure_logging, log_context
 from job_matcher.main import JobMatcherFlow
+from job_matcher.optimization import generate_resume_optimization
+from job_matcher.profiling import PROFILE_TRACE_MEMORY, PROFILING_ENABLED, RequestProfile, request_timings
+from job_matcher.quota import quota_metrics
+from job_matcher.scheduler import Priority, match_scheduler
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (non-blocking; JSON and quiet crews with LOG_MODE=production)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
@@ -56,6 +70,27 @@ class JobMatchRequest(BaseModel):
         None, 
         description="Optional CV data. If not provided, will fetch from resume service using user_id"
     )
+    stream: bool = Field(
+        False,
+        description="Stream the match and publish partial results (score first) while processing"
+    )
+    include_optimization: bool = Field(
+        False,
+        description="Generate resume optimization feedback in the same run instead of on demand"
+    )
+    priority: Priority = Field(
+        Priority.INTERACTIVE,
+        description="Scheduling class: interactive, batch or background"
+    )
+    deadline_seconds: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Drop the request if it has not finished scraping/matching within this many seconds"
+    )
+    profile: bool = Field(
+        False,
+        description="Profile this run: sampled stacks (flamegraph) and per-stage memory (also X-Profile: 1)"
+    )
     
     class Config:
         json_schema_extra = {
@@ -72,13 +107,31 @@ class JobMatchResponse(BaseModel):
     request_id: str = Field(..., description="Unique identifier for this matching request")
     user_id: str
     job_url: str
-    status: str = Field(..., description="Status: processing, completed, failed")
+    status: str = Field(..., description="Status: queued, processing, completed, failed")
+    priority: str = Field(Priority.INTERACTIVE.value, description="Scheduling class")
+    job_title: Optional[str] = Field(None, description="Title of the extracted job posting")
+    canonical_job_url: Optional[str] = Field(
+        None, description="Posting this job was identified with (itself unless it is a duplicate)"
+    )
+    match_score: Optional[float] = Field(None, description="Overall match score if completed")
     match_result: Optional[Dict] = Field(None, description="Matching results if completed")
     error: Optional[str] = Field(None, description="Error message if failed")
+    profile: Optional[Dict] = Field(
+        None, description="Stage timings, sample count and per-stage memory of a profiled run"
+    )
+    version: int = Field(1, description="Incremented on every change to the request")
     created_at: str
+    updated_at: Optional[str] = None
     completed_at: Optional[str] = None
 
 
+class ResumeOptimizationResponse(BaseModel):
+    """Response model for on-demand resume optimization"""
+    request_id: str
+    cached: bool = Field(..., description="Whether the feedback was served from cache")
+    resume_optimization: Dict
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str
@@ -91,6 +144,15 @@ class HealthResponse(BaseModel):
 # In-memory storage for job matching results (in production, use Redis/MongoDB)
 job_match_results: Dict[str, Dict] = {}
 
+# CV and extracted job per completed request, needed to generate optimization on demand
+job_match_contexts: Dict[str, Dict] = {}
+
+# Collapsed stacks of profiled requests, served by get_job_match_profile
+job_match_profiles: Dict[str, str] = {}
+
+# Fields returned by list_job_matches for view=summary
+SUMMARY_FIELDS = ("request_id", "status", "match_score", "job_title", "created_at")
+
 
 async def fetch_cv_from_resume_service(user_id: str) -> Dict:
     """
@@ -145,7 +207,25 @@ async def fetch_cv_from_resume_service(user_id: str) -> Dict:
         )
 
 
-def process_job_match(request_id: str, user_id: str, job_url: str, cv_data: Dict):
+def update_job_match(request_id: str, **fields) -> Dict:
+    """Update a stored request and bump its version, which invalidates ETags and cached bodies"""
+    record = job_match_results[request_id]
+    record.update(fields)
+    record["version"] += 1
+    record["updated_at"] = datetime.utcnow().isoformat()
+    return record
+
+
+def process_job_match(
+    request_id: str,
+    user_id: str,
+    job_url: str,
+    cv_data: Dict,
+    stream: bool = False,
+    include_optimization: bool = False,
+    deadline: Optional[float] = None,
+    profile: bool = False
+):
     """
     Background task to process job matching
     
@@ -154,40 +234,195 @@ def process_job_match(request_id: str, user_id: str, job_url: str, cv_data: Dict
         user_id: User ID
         job_url: Job posting URL
         cv_data: CV data dictionary
+        stream: Publish partial match results while the LLM is still generating
+        include_optimization: Generate resume optimization feedback in the same run
+        deadline: Absolute epoch seconds after which the flow stops before its next stage
+        profile: Sample the run's stacks and snapshot memory per stage
+    
+    Stage timings are recorded for every run (see slowest_job_matches).
+    The flow checkpoints its state under the request id, so a failed request can be
+    retried, or an interrupted one resumed, from its first incomplete stage.
     """
-    try:
-        logger.info(f"🚀 Starting job match processing for request {request_id}")
-        
-        # Update status to processing
-        job_match_results[request_id]["status"] = "processing"
-        
-        # Create trigger payload for CrewAI Flow
-        trigger_payload = {
-            "cv_data": cv_data,
-            "candidate_id": user_id,
-            "job_url": job_url
+    run_profile = RequestProfile(sample=profile, trace_memory=profile and PROFILE_TRACE_MEMORY)
+    with log_context(request_id=request_id):
+        try:
+            logger.info(f"🚀 Starting job match processing for request {request_id}")
+            
+            # Update status to processing
+            record = update_job_match(request_id, status="processing")
+            
+            # Create trigger payload for CrewAI Flow
+            trigger_payload = {
+                "cv_data": cv_data,
+                "candidate_id": user_id,
+                "job_url": job_url,
+                "stream": stream,
+                "include_optimization": include_optimization,
+                "deadline": deadline,
+                "checkpoint_id": request_id,
+                # Not used by the flow, kept in the checkpoint to resubmit after a restart
+                "priority": record["priority"],
+                "created_at": record["created_at"],
+                "profile": profile
+            }
+            
+            def publish_partial_result(partial: Dict):
+                update_job_match(
+                    request_id,
+                    match_score=partial.get("overall_match_score"),
+                    match_result=partial
+                )
+            
+            # Run the JobMatcher Flow (synchronous call - CrewAI handles its own event loop)
+            flow = JobMatcherFlow(
+                on_partial_result=publish_partial_result if stream else None,
+                profile=run_profile
+            )
+            with run_profile.running():
+                result = flow.kickoff(inputs={"crewai_trigger_payload": trigger_payload})
+            request_timings.record(request_id, "completed", run_profile)
+            
+            # Update results
+            job_match_contexts[request_id] = {
+                "cv_data": cv_data,
+                "scraped_job": flow.state.scraped_job
+            }
+            update_job_match(
+                request_id,
+                status="completed",
+                job_title=flow.state.scraped_job.get("title"),
+                canonical_job_url=flow.state.canonical_job_url or None,
+                match_score=result.get("overall_match_score") if isinstance(result, dict) else None,
+                match_result=result,
+                profile=_profile_result(request_id, run_profile),
+                completed_at=datetime.utcnow().isoformat()
+            )
+            get_checkpoint_store().delete(request_id)
+            
+            logger.info(f"✅ Job match completed for request {request_id}")
+            
+        except Exception as e:
+            logger.error(f"❌ Job match failed for request {request_id}: {e}")
+            request_timings.record(request_id, "failed", run_profile)
+            update_job_match(
+                request_id,
+                status="failed",
+                error=str(e),
+                profile=_profile_result(request_id, run_profile),
+                completed_at=datetime.utcnow().isoformat()
+            )
+
+
+def _profile_result(request_id: str, run_profile: RequestProfile) -> Optional[Dict]:
+    """Keep the stacks of a profiled run and return its summary for the result (None if not profiled)"""
+    if not run_profile.profiled:
+        return None
+    stacks = run_profile.collapsed_stacks()
+    if stacks:
+        job_match_profiles[request_id] = stacks
+    return run_profile.summary()
+
+
+def schedule_job_match(
+    request_id: str,
+    user_id: str,
+    job_url: str,
+    cv_data: Dict,
+    stream: bool,
+    include_optimization: bool,
+    priority: Priority,
+    deadline: Optional[float],
+    profile: bool = False
+):
+    """Queue process_job_match on the priority scheduler"""
+    def mark_expired():
+        error = "Deadline exceeded before processing started"
+        update_job_match(
+            request_id,
+            status="failed",
+            error=error,
+            completed_at=datetime.utcnow().isoformat()
+        )
+        _fail_checkpoint(request_id, error)
+    
+    match_scheduler.submit(
+        process_job_match,
+        request_id,
+        user_id,
+        job_url,
+        cv_data,
+        stream,
+        include_optimization,
+        deadline,
+        profile,
+        priority=priority,
+        deadline=deadline,
+        on_expired=mark_expired
+    )
+
+
+def _fail_checkpoint(request_id: str, error: str):
+    """Mark a request's checkpoint (if any) as failed so it is not resumed after a restart"""
+    store = get_checkpoint_store()
+    checkpoint = store.load(request_id)
+    if checkpoint is not None and checkpoint.get("status") == "running":
+        store.save(request_id, checkpoint["payload"], checkpoint["state"], status="failed", error=error)
+
+
+@app.on_event("startup")
+def resume_interrupted_matches():
+    """
+    Requeue matches that were still running when the service stopped
+    
+    Their checkpoints let them continue from the first incomplete stage. Matches whose
+    deadline passed while the service was down are marked failed (and can be retried).
+    """
+    store = get_checkpoint_store()
+    purged = store.purge()
+    if purged:
+        logger.info(f"🧹 Purged {purged} stale checkpoints")
+    
+    for checkpoint in store.interrupted():
+        request_id = checkpoint["checkpoint_id"]
+        payload = checkpoint["payload"]
+        priority = Priority(payload.get("priority") or Priority.INTERACTIVE.value)
+        job_match_results[request_id] = {
+            "request_id": request_id,
+            "user_id": payload.get("candidate_id"),
+            "job_url": payload.get("job_url"),
+            "status": "queued",
+            "priority": priority.value,
+            "job_title": None,
+            "canonical_job_url": None,
+            "match_score": None,
+            "match_result": None,
+            "error": None,
+            "profile": None,
+            "version": 1,
+            "created_at": payload.get("created_at") or datetime.utcnow().isoformat(),
+            "updated_at": datetime.utcnow().isoformat(),
+            "completed_at": None
         }
+        deadline = payload.get("deadline")
+        if deadline and deadline <= time.time():
+            error = "Deadline exceeded before the interrupted match could resume"
+            update_job_match(request_id, status="failed", error=error, completed_at=datetime.utcnow().isoformat())
+            _fail_checkpoint(request_id, error)
+            logger.warning(f"⏰ Not resuming interrupted job match {request_id}: deadline exceeded")
+            continue
         
-        # Run the JobMatcher Flow (synchronous call - CrewAI handles its own event loop)
-        flow = JobMatcherFlow()
-        result = flow.kickoff(inputs={"crewai_trigger_payload": trigger_payload})
-        
-        # Update results
-        job_match_results[request_id].update({
-            "status": "completed",
-            "match_result": result,
-            "completed_at": datetime.utcnow().isoformat()
-        })
-        
-        logger.info(f"✅ Job match completed for request {request_id}")
-        
-    except Exception as e:
-        logger.error(f"❌ Job match failed for request {request_id}: {e}")
-        job_match_results[request_id].update({
-            "status": "failed",
-            "error": str(e),
-            "completed_at": datetime.utcnow().isoformat()
-        })
+        schedule_job_match(
+            request_id,
+            payload.get("candidate_id"),
+            payload.get("job_url"),
+            payload.get("cv_data"),
+            bool(payload.get("stream")),
+            bool(payload.get("include_optimization")),
+            priority,
+            deadline,
+            bool(payload.get("profile"))
+        )
+        logger.info(f"♻️  Resuming interrupted job match {request_id}")
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -218,7 +453,7 @@ async def health_check():
 
 
 @app.post("/api/v1/jobs/match", response_model=JobMatchResponse, status_code=status.HTTP_202_ACCEPTED)
-async def create_job_match(request: JobMatchRequest, background_tasks: BackgroundTasks):
+async def create_job_match(request: JobMatchRequest, x_profile: Optional[str] = Header(None)):
     """
     Create a new job matching request
     
@@ -226,9 +461,22 @@ async def create_job_match(request: JobMatchRequest, background_tasks: Backgroun
     and processes the job match in the background.
     
     If cv_data is provided in the request, it will be used instead of fetching from resume service.
+    Requests are scheduled by priority (interactive before batch before background), and
+    requests with deadline_seconds are dropped once the deadline passes.
+    
+    With profile=true (or an X-Profile: 1 header) the run is profiled: the result gets
+    a per-stage breakdown with memory, and its flamegraph stacks are available from
+    GET /api/v1/jobs/match/{request_id}/profile.
     """
     import uuid
     
+    profile = request.profile or (x_profile or "").lower() in ("1", "true", "yes")
+    if profile and not PROFILING_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Profiling is disabled on this service (PROFILING_ENABLED=false)"
+        )
+    
     request_id = str(uuid.uuid4())
     logger.info(f"📨 Received job match request {request_id} for user {request.user_id}")
     
@@ -242,24 +490,40 @@ async def create_job_match(request: JobMatchRequest, background_tasks: Backgroun
             cv_data = await fetch_cv_from_resume_service(request.user_id)
         
         # Initialize result tracking
+        now = datetime.utcnow().isoformat()
         job_match_results[request_id] = {
             "request_id": request_id,
             "user_id": request.user_id,
             "job_url": str(request.job_url),
             "status": "queued",
+            "priority": request.priority.value,
+            "job_title": None,
+            "canonical_job_url": None,
+            "match_score": None,
             "match_result": None,
             "error": None,
-            "created_at": datetime.utcnow().isoformat(),
+            "profile": None,
+            "version": 1,
+            "created_at": now,
+            "updated_at": now,
             "completed_at": None
         }
         
-        # Add to background tasks
-        background_tasks.add_task(
-            process_job_match,
+        deadline = (
+            time.time() + request.deadline_seconds
+            if request.deadline_seconds else None
+        )
+        
+        schedule_job_match(
             request_id,
             request.user_id,
             str(request.job_url),
-            cv_data
+            cv_data,
+            request.stream,
+            request.include_optimization,
+            request.priority,
+            deadline,
+            profile
         )
         
         return JobMatchResponse(**job_match_results[request_id])
@@ -275,11 +539,13 @@ async def create_job_match(request: JobMatchRequest, background_tasks: Backgroun
 
 
 @app.get("/api/v1/jobs/match/{request_id}", response_model=JobMatchResponse)
-async def get_job_match_result(request_id: str):
+async def get_job_match_result(request_id: str, request: Request):
     """
     Get the result of a job matching request
     
     Returns the current status and result (if completed) of a job matching request.
+    Supports If-None-Match / If-Modified-Since: an unchanged result is answered with
+    304 Not Modified. Bodies are gzip/br compressed when accepted by the client.
     """
     if request_id not in job_match_results:
         raise HTTPException(
@@ -287,27 +553,273 @@ async def get_job_match_result(request_id: str):
             detail=f"Job match request {request_id} not found"
         )
     
-    return JobMatchResponse(**job_match_results[request_id])
+    record = job_match_results[request_id]
+    version, updated_at = record["version"], record["updated_at"]
+    headers = cache_headers(version, updated_at, record["status"])
+    if is_not_modified(request, headers["ETag"], updated_at, record["status"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    body, encoding = response_cache.body(
+        ("match", request_id),
+        version,
+        lambda: JobMatchResponse(**record).model_dump_json().encode("utf-8"),
+        choose_encoding(request),
+        # Finished results are read many times; running ones change before the next poll
+        cache=record["status"] in TERMINAL_STATUSES
+    )
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.post("/api/v1/jobs/match/{request_id}/optimization", response_model=ResumeOptimizationResponse)
+async def get_resume_optimization(request_id: str, request: Request):
+    """
+    Get resume optimization feedback for a completed job match
+    
+    Generated on first request and cached per (CV, job), so repeated calls for the
+    same CV and job posting return immediately. The response is gzip/br compressed
+    when accepted by the client.
+    """
+    if request_id not in job_match_results:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job match request {request_id} not found"
+        )
+    
+    record = job_match_results[request_id]
+    context = job_match_contexts.get(request_id)
+    if record["status"] != "completed" or context is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job match request {request_id} is not completed (status: {record['status']})"
+        )
+    
+    match_result = record["match_result"] or {}
+    if "resume_optimization" in match_result:
+        return _optimization_response(request, ResumeOptimizationResponse(
+            request_id=request_id,
+            cached=True,
+            resume_optimization=match_result["resume_optimization"]
+        ), record["version"])
+    
+    try:
+        # Rate-limited or transient LLM failures are retried with backoff, as in the flow
+        optimization, cached = await run_in_threadpool(
+            call_with_retries,
+            "resume_optimization",
+            lambda: generate_resume_optimization(context["cv_data"], context["scraped_job"], match_result)
+        )
+    except Exception as e:
+        logger.error(f"❌ Resume optimization failed for request {request_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Error generating resume optimization: {str(e)}"
+        )
+    
+    if optimization.get("parsing_failed"):
+        # Not stored (nor cached by generate_resume_optimization): the next call tries again
+        logger.error(f"❌ Resume optimization for request {request_id} could not be parsed")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Resume optimization output could not be parsed, please try again"
+        )
+    
+    update_job_match(request_id, match_result={**match_result, "resume_optimization": optimization})
+    return _optimization_response(request, ResumeOptimizationResponse(
+        request_id=request_id,
+        cached=cached,
+        resume_optimization=optimization
+    ))
+
+
+def _optimization_response(
+    request: Request,
+    response: ResumeOptimizationResponse,
+    version: Optional[int] = None
+) -> Response:
+    """
+    Serialize (and compress) an optimization response
+    
+    With a version, the bodies are kept for later requests for the same version.
+    """
+    body, encoding = response_cache.body(
+        ("optimization", response.request_id),
+        version or 0,
+        lambda: response.model_dump_json().encode("utf-8"),
+        choose_encoding(request),
+        cache=version is not None
+    )
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/v1/jobs/match/{request_id}/profile", response_class=PlainTextResponse)
+async def get_job_match_profile(request_id: str):
+    """
+    Get the sampled stacks of a profiled job match
+    
+    Collapsed-stack text ("frame;frame;frame count" per line): render it with
+    flamegraph.pl or load it into speedscope.
+    """
+    if request_id not in job_match_results:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job match request {request_id} not found"
+        )
+    if request_id not in job_match_profiles:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No profile for job match request {request_id} (not profiled or not finished)"
+        )
+    return PlainTextResponse(job_match_profiles[request_id])
+
+
+@app.post(
+    "/api/v1/jobs/match/{request_id}/retry",
+    response_model=JobMatchResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def retry_job_match(request_id: str):
+    """
+    Retry a failed job match request
+    
+    Resumes from the request's checkpoint: stages that completed before the failure
+    (e.g. scraping and job extraction) are not repeated. The retry has no deadline.
+    """
+    if request_id not in job_match_results:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job match request {request_id} not found"
+        )
+    
+    record = job_match_results[request_id]
+    checkpoint = get_checkpoint_store().load(request_id)
+    if record["status"] != "failed" or checkpoint is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job match request {request_id} cannot be retried (status: {record['status']})"
+        )
+    
+    payload = checkpoint["payload"]
+    record = update_job_match(request_id, status="queued", error=None, completed_at=None)
+    schedule_job_match(
+        request_id,
+        payload.get("candidate_id"),
+        payload.get("job_url"),
+        payload.get("cv_data"),
+        bool(payload.get("stream")),
+        bool(payload.get("include_optimization")),
+        Priority(record["priority"]),
+        None,
+        bool(payload.get("profile"))
+    )
+    logger.info(f"🔁 Retrying job match {request_id} from its checkpoint")
+    return JobMatchResponse(**record)
+
+
+def _encode_cursor(record: Dict) -> str:
+    """Encode the sort key of a record as an opaque pagination cursor"""
+    raw = f"{record['created_at']}|{record['request_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """
+    Decode a pagination cursor back into its (created_at, request_id) sort key
+    
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        created_at, request_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return created_at, request_id
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {cursor}"
+        )
+
+
+def _resolve_fields(fields: Optional[str], view: str) -> Optional[List[str]]:
+    """
+    Resolve the list of fields to project for list_job_matches
+    
+    Returns:
+        List of field names, or None to return full records
+        
+    Raises:
+        HTTPException: If an unknown field or view is requested
+    """
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = set(selected) - set(JobMatchResponse.model_fields)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        return selected
+    
+    if view == "summary":
+        return list(SUMMARY_FIELDS)
+    if view == "full":
+        return None
+    
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Unknown view: {view}. Expected 'summary' or 'full'"
+    )
 
 
 @app.get("/api/v1/jobs/match")
-async def list_job_matches(user_id: Optional[str] = None, limit: int = 10):
+async def list_job_matches(
+    user_id: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    view: str = "full",
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None
+):
     """
-    List job matching requests
+    List job matching requests, newest first
     
-    Optionally filter by user_id.
+    Optionally filter by user_id and status. Use view=summary or a comma-separated
+    fields list to return only selected fields, and pass next_cursor back as cursor
+    to fetch the next page.
     """
-    results = list(job_match_results.values())
+    selected_fields = _resolve_fields(fields, view)
+    after = _decode_cursor(cursor) if cursor else None
     
-    if user_id:
-        results = [r for r in results if r["user_id"] == user_id]
+    def sort_key(record: Dict) -> tuple:
+        return record["created_at"], record["request_id"]
     
-    # Sort by created_at descending
-    results.sort(key=lambda x: x["created_at"], reverse=True)
+    total = 0
+    candidates = []
+    for record in job_match_results.values():
+        if user_id and record["user_id"] != user_id:
+            continue
+        if status_filter and record["status"] != status_filter:
+            continue
+        total += 1
+        if after and sort_key(record) >= after:
+            continue
+        candidates.append(record)
+    
+    # Top-k selection instead of sorting the full history
+    page = heapq.nlargest(limit + 1, candidates, key=sort_key)
+    next_cursor = _encode_cursor(page[limit - 1]) if len(page) > limit else None
+    page = page[:limit]
+    
+    if selected_fields is not None:
+        page = [{f: record.get(f) for f in selected_fields} for record in page]
     
     return {
-        "total": len(results),
-        "results": results[:limit]
+        "total": total,
+        "results": page,
+        "next_cursor": next_cursor
     }
 
 
@@ -321,6 +833,10 @@ async def delete_job_match(request_id: str):
         )
     
     del job_match_results[request_id]
+    job_match_contexts.pop(request_id, None)
+    job_match_profiles.pop(request_id, None)
+    request_timings.discard(request_id)
+    get_checkpoint_store().delete(request_id)
     return {"message": "Job match request deleted successfully"}
 
 
@@ -336,10 +852,28 @@ async def get_configuration():
             "gemini": "configured" if os.getenv("GEMINI_API_KEY") else "not_configured",
             "firecrawl": "configured" if os.getenv("FIRECRAWL_API_KEY") else "not_configured"
         },
+        "scheduler": match_scheduler.stats(),
+        "quotas": quota_metrics(),
         "environment": os.getenv("ENVIRONMENT", "development")
     }
 
 
+@app.get("/api/v1/jobs/debug/slowest")
+async def slowest_job_matches(limit: int = Query(10, ge=1, le=100)):
+    """
+    List the slowest recently finished job matches with their per-stage breakdowns (for debugging)
+    
+    Stage timings are kept for every run; profiled runs also have sample counts and
+    per-stage memory. Only available with PROFILING_ENABLED=true.
+    """
+    if not PROFILING_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Profiling is disabled on this service (PROFILING_ENABLED=false)"
+        )
+    return {"results": request_timings.slowest(limit)}
+
+
 # Root redirect
 @app.get("/")
 async def root():
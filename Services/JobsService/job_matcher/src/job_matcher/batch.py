@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+"""
+Offline bulk matching over JSONL
+Runs JobMatcherFlow for every trigger payload in a JSONL file (or stdin) on a process pool
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, Set, Tuple
+
+# Provider budgets that are split evenly between worker processes
+_PER_PROCESS_BUDGETS = {
+    "GEMINI_RPM": "60",
+    "GEMINI_TPM": "1000000",
+    "FIRECRAWL_RPM": "20",
+}
+
+
+def _read_records(source) -> Iterator[Tuple[str, Dict]]:
+    """
+    Yield (record_id, trigger_payload) for each JSONL line
+
+    Lines may hold either {"crewai_trigger_payload": {...}} or the payload itself;
+    lines that are not JSON objects are skipped.
+    The record id is the payload's "id" field, or the line number if absent.
+    """
+    for line_no, line in enumerate(source, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            print(f"⚠️  Skipping invalid JSON on line {line_no}", file=sys.stderr)
+            continue
+        payload = record.get("crewai_trigger_payload", record) if isinstance(record, dict) else None
+        if not isinstance(payload, dict):
+            print(f"⚠️  Skipping invalid JSON on line {line_no}", file=sys.stderr)
+            continue
+        record_id = str(record.get("id") or payload.get("id") or line_no)
+        yield record_id, payload
+
+
+def _load_checkpoint(output_path: str) -> Set[str]:
+    """Ids of records already completed in a previous run's output file"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Truncated last line from an interrupted run
+            if result.get("status") == "completed":
+                done.add(result["id"])
+    return done
+
+
+def _max_workers_within_budgets() -> int:
+    """
+    Most workers the provider budgets can be split between
+
+    Each worker needs at least one request per minute of every budget.
+    """
+    return max(1, min(int(float(os.getenv(name, default))) for name, default in _PER_PROCESS_BUDGETS.items()))
+
+
+def _init_worker(cache_dir: str, workers: int):
+    """Configure a worker process before the flow (and its quota manager) is imported"""
+    os.environ["JOB_MATCHER_CACHE_DIR"] = cache_dir
+    for name, default in _PER_PROCESS_BUDGETS.items():
+        total = float(os.getenv(name, default))
+        os.environ[name] = str(max(1.0, total / workers))
+
+    from job_matcher.logging_config import configure_logging
+    configure_logging()
+
+
+def _run_record(record_id: str, payload: Dict) -> Dict:
+    """Run the flow for one payload inside a worker process"""
+    from job_matcher.main import JobMatcherFlow
+
+    start_time = time.time()
+    try:
+        flow = JobMatcherFlow()
+        result = flow.kickoff(inputs={"crewai_trigger_payload": payload})
+        return {
+            "id": record_id,
+            "status": "completed",
+            "job_url": payload.get("job_url"),
+            "candidate_id": payload.get("candidate_id"),
+            "job_title": flow.state.scraped_job.get("title"),
+            "match_result": result,
+            "elapsed_seconds": round(time.time() - start_time, 2)
+        }
+    except Exception as e:
+        return {
+            "id": record_id,
+            "status": "failed",
+            "job_url": payload.get("job_url"),
+            "candidate_id": payload.get("candidate_id"),
+            "error": str(e),
+            "elapsed_seconds": round(time.time() - start_time, 2)
+        }
+
+
+def run_batch():
+    """
+    Bulk-match trigger payloads from JSONL.
+
+    Results are appended to the output file as they finish. Re-running with the same
+    output file resumes: records already completed there are skipped, failed ones are retried.
+    """
+    parser = argparse.ArgumentParser(description="Run JobMatcherFlow over a JSONL file of trigger payloads")
+    parser.add_argument("input", help="JSONL file of crewai_trigger_payload records, or '-' for stdin")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file to append results to (also the checkpoint)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument(
+        "--cache-dir",
+        default=os.getenv("JOB_MATCHER_CACHE_DIR", ".job_matcher_cache"),
+        help="Directory for scrape and extraction caches shared by the workers"
+    )
+    parser.add_argument("--report-every", type=int, default=10, help="Print throughput every N results")
+    args = parser.parse_args()
+    if args.report_every < 1:
+        parser.error("--report-every must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    max_workers = _max_workers_within_budgets()
+    if args.workers > max_workers:
+        # More workers would each be rounded up to 1/min and exceed the provider budget together
+        print(
+            f"⚠️  Using {max_workers} workers instead of {args.workers}: the provider budgets "
+            f"({', '.join(_PER_PROCESS_BUDGETS)}) allow at most one request per minute per worker",
+            file=sys.stderr
+        )
+        args.workers = max_workers
+
+    done = _load_checkpoint(args.output)
+    if done:
+        print(f"♻️  Resuming: {len(done)} records already completed in {args.output}")
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    counts = {"completed": 0, "failed": 0, "skipped": 0}
+    start_time = time.time()
+
+    def report():
+        elapsed = time.time() - start_time
+        finished = counts["completed"] + counts["failed"]
+        rate = finished / elapsed * 60 if elapsed > 0 else 0.0
+        print(
+            f"📊 {finished} finished ({counts['completed']} completed, {counts['failed']} failed, "
+            f"{counts['skipped']} skipped) in {elapsed:.1f}s - {rate:.1f} records/min"
+        )
+
+    try:
+        with open(args.output, "a", encoding="utf-8") as out, ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=_init_worker,
+            initargs=(os.path.abspath(args.cache_dir), args.workers)
+        ) as pool:
+            pending = set()
+
+            def drain(block_until: int):
+                # Write finished results until at most block_until futures are pending
+                nonlocal pending
+                while len(pending) > block_until:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        result = future.result()
+                        out.write(json.dumps(result, default=str) + "\n")
+                        out.flush()
+                        counts[result["status"]] += 1
+                        if (counts["completed"] + counts["failed"]) % args.report_every == 0:
+                            report()
+
+            for record_id, payload in _read_records(source):
+                if record_id in done:
+                    counts["skipped"] += 1
+                    continue
+                pending.add(pool.submit(_run_record, record_id, payload))
+                # Bound in-flight work so huge inputs are streamed, not loaded at once
+                drain(args.workers * 2)
+
+            drain(0)
+    except KeyboardInterrupt:
+        print("\n⏹️  Interrupted - re-run with the same --output to resume")
+        raise
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        report()
+
+
+if __name__ == "__main__":
+    run_batch()
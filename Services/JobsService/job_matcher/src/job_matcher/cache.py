@@ -0,0 +1,105 @@
+"""
+Disk-backed JSON cache shared between processes, and an in-memory LRU cache
+The disk cache is used for scrape and extraction results when JOB_MATCHER_CACHE_DIR is set
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Iterator, Optional
+
+
+def content_hash(data) -> str:
+    """Stable SHA-256 hash of JSON-serializable data (key order independent)"""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class DiskCache:
+    """
+    JSON values stored as one file per key under a directory.
+
+    Writes go to a temporary file and are renamed into place, so concurrent
+    processes never observe partially written entries.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, value: Any):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def delete(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def values(self) -> Iterator[Any]:
+        """Every stored value, in no particular order"""
+        for path in self.directory.glob("*.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    yield json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue  # Deleted or replaced while listing
+
+
+def get_cache(namespace: str) -> Optional[DiskCache]:
+    """
+    Cache for namespace under JOB_MATCHER_CACHE_DIR, or None if caching is disabled
+
+    Args:
+        namespace: Sub-directory for this kind of entry (e.g. "scrape", "extraction")
+    """
+    cache_dir = os.getenv("JOB_MATCHER_CACHE_DIR")
+    if not cache_dir:
+        return None
+    return DiskCache(os.path.join(cache_dir, namespace))
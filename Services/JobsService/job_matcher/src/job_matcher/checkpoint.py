@@ -0,0 +1,204 @@
+"""
+Durable checkpoints for JobMatcherFlow runs
+The flow state is saved after every stage so a failed or restarted run resumes at the
+first incomplete stage instead of repeating the Firecrawl scrape and extraction call
+"""
+
+import functools
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import requests
+
+from job_matcher.cache import DiskCache, content_hash
+from job_matcher.cv_encoder import strip_personal_data
+from job_matcher.quota import QuotaTimeout, is_rate_limit_error
+from job_matcher.scheduler import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+# Extra attempts for a failed stage before the run fails, and the first backoff delay
+STAGE_MAX_RETRIES = int(os.getenv("STAGE_MAX_RETRIES", "2"))
+STAGE_RETRY_BACKOFF = float(os.getenv("STAGE_RETRY_BACKOFF", "2"))
+# Checkpoints of abandoned runs are purged after this long
+CHECKPOINT_TTL_SECONDS = float(os.getenv("CHECKPOINT_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Failures that another attempt cannot fix
+NON_RETRYABLE_ERRORS = (DeadlineExceeded, QuotaTimeout)
+# Network failures and timeouts of the HTTP clients used by Firecrawl and the LLM client
+TRANSIENT_ERRORS = (TimeoutError, ConnectionError, httpx.TransportError, requests.ConnectionError, requests.Timeout)
+# Request timeout, rate limiting; 5xx responses are transient too
+TRANSIENT_STATUS_CODES = {408, 429}
+TRANSIENT_MESSAGES = (
+    "timed out", "timeout", "connection reset", "connection aborted", "connection refused",
+    "temporarily unavailable", "service unavailable", "internal server error", "bad gateway",
+)
+
+
+def checkpoint_dir() -> str:
+    return os.getenv("JOB_MATCHER_CHECKPOINT_DIR") or os.path.join(
+        os.getenv("JOB_MATCHER_CACHE_DIR", ".job_matcher_cache"), "checkpoints"
+    )
+
+
+def input_hash(payload: Dict) -> str:
+    """Hash of the inputs a checkpoint was computed from (CV without personal data, job URL)"""
+    return content_hash({"cv_data": strip_personal_data(payload.get("cv_data")), "job_url": payload.get("job_url")})
+
+
+def _without_personal_data(record: Dict) -> Dict:
+    """Payload or flow state with the CV's contact details and personal attributes removed"""
+    if not isinstance(record.get("cv_data"), dict):
+        return record
+    return {**record, "cv_data": strip_personal_data(record["cv_data"])}
+
+
+class CheckpointStore:
+    """
+    One JSON record per run, keyed by checkpoint id (the API request id).
+
+    A record holds the trigger payload, so the run can be resubmitted after a restart,
+    the serialized flow state, and a status: "running" while stages are executing,
+    "failed" once a stage has exhausted its retries. The CV is stored without personal
+    data (contact details, name...); matching never uses it.
+    """
+
+    def __init__(self, directory: str):
+        self._cache = DiskCache(directory)
+
+    def load(self, checkpoint_id: str) -> Optional[Dict]:
+        return self._cache.get(checkpoint_id)
+
+    def save(
+        self,
+        checkpoint_id: str,
+        payload: Dict,
+        state: Dict,
+        status: str = "running",
+        error: Optional[str] = None
+    ):
+        self._cache.put(checkpoint_id, {
+            "checkpoint_id": checkpoint_id,
+            "payload": _without_personal_data(payload),
+            "state": _without_personal_data(state),
+            "status": status,
+            "error": error,
+            "updated_at": time.time()
+        })
+
+    def delete(self, checkpoint_id: str):
+        self._cache.delete(checkpoint_id)
+
+    def interrupted(self) -> List[Dict]:
+        """Runs that were still executing when the process stopped, oldest first"""
+        records = [record for record in self._cache.values() if record.get("status") == "running"]
+        return sorted(records, key=lambda record: record.get("updated_at", 0))
+
+    def purge(self, max_age: float = CHECKPOINT_TTL_SECONDS) -> int:
+        """Delete checkpoints not updated for max_age seconds; returns how many"""
+        cutoff = time.time() - max_age
+        stale = [record for record in self._cache.values() if record.get("updated_at", 0) < cutoff]
+        for record in stale:
+            self.delete(record["checkpoint_id"])
+        return len(stale)
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Store under JOB_MATCHER_CHECKPOINT_DIR (default: <JOB_MATCHER_CACHE_DIR>/checkpoints)"""
+    return CheckpointStore(checkpoint_dir())
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    response = getattr(error, "response", None)
+    for value in (getattr(error, "status_code", None), getattr(response, "status_code", None)):
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Best-effort detection of failures worth another attempt: network errors, timeouts,
+    5xx responses and rate limiting. Errors are also checked through their causes, as
+    crewai and the provider clients wrap them.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, NON_RETRYABLE_ERRORS):
+            return False
+        status_code = _status_code(error)
+        if (
+            isinstance(error, TRANSIENT_ERRORS)
+            or is_rate_limit_error(error)
+            or status_code in TRANSIENT_STATUS_CODES
+            or (status_code is not None and status_code >= 500)
+            or any(message in str(error).lower() for message in TRANSIENT_MESSAGES)
+        ):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def call_with_retries(
+    stage: str,
+    func: Callable[[], Any],
+    deadline: float = 0.0,
+    retries: int = STAGE_MAX_RETRIES,
+    backoff: float = STAGE_RETRY_BACKOFF
+) -> Any:
+    """
+    Call func, retrying transient failures (see is_transient_error) with exponential backoff
+
+    Args:
+        stage: Stage name for log messages
+        func: The stage body
+        deadline: Absolute epoch seconds; no retry is attempted that would start after it
+        retries: Extra attempts after the first failure
+        backoff: Delay before the first retry, doubled for every further one
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            delay = backoff * 2 ** attempt
+            if (
+                attempt == retries
+                or not is_transient_error(e)
+                or (deadline and time.time() + delay > deadline)
+            ):
+                raise
+            logger.warning(f"🔁 {stage} failed ({e}), retrying in {delay:.0f}s ({attempt + 1}/{retries})")
+            time.sleep(delay)
+
+
+def checkpointed(method: Callable) -> Callable:
+    """
+    Make a flow stage resumable
+
+    The stage is skipped if a restored checkpoint already completed it. Otherwise it is
+    run with retries, and the flow checkpoint is saved once it completes (or fails).
+    The flow must provide state.completed_stages, state.deadline and _save_checkpoint().
+    """
+    stage = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if stage in self.state.completed_stages:
+            logger.info(f"⏭️  Skipping {stage} (completed before the checkpoint)")
+            return self.state.match_result or None
+
+        try:
+            result = call_with_retries(stage, lambda: method(self, *args, **kwargs), self.state.deadline)
+        except Exception as e:
+            self._save_checkpoint(status="failed", error=f"{stage}: {e}")
+            raise
+
+        self.state.completed_stages.append(stage)
+        self._save_checkpoint()
+        return result
+
+    return wrapper
@@ -1,4 +1,5 @@
 from typing import List
+import logging
 import os
 
 from crewai import Agent, Crew, Process, Task
@@ -9,6 +10,10 @@ from pathlib import Path
 from dotenv import load_dotenv
 from crewai import LLM
 
+from job_matcher.logging_config import CREW_VERBOSE
+from job_matcher.quota import limit_llm_calls
+
+logger = logging.getLogger(__name__)
 
 env_path = Path(__file__).parent.parent.parent.parent.parent / '.env'
 
@@ -21,18 +26,26 @@ if not api_key:
         f"GEMINI_API_KEY not found! Please check your .env file at: {env_path.absolute()}"
     )
 
-print(f"✅ Loaded API key from: {env_path.absolute()}")
-print(f"🔑 API Key starts with: {api_key[:10]}...")
+logger.debug(f"✅ Loaded environment from: {env_path.absolute()}")
 
 # Configure LLM with Gemini - Lower temperature for extraction
 model_name = os.environ.get("MODEL", "gemini/gemini-1.5-flash")
-print(f"📦 Using model: {model_name}")
+logger.info(f"📦 Using model: {model_name}")
 
-llm = LLM(
+# Every Gemini request (including crewai re-prompts) acquires the shared LLM quota
+llm = limit_llm_calls(LLM(
     model=model_name,
     api_key=api_key,
     temperature=0.1  # Very low temperature for accurate extraction
-)
+))
+
+# Same model with token streaming, used when partial match results are requested
+streaming_llm = limit_llm_calls(LLM(
+    model=model_name,
+    api_key=api_key,
+    temperature=0.1,
+    stream=True
+))
 
 
 @CrewBase
@@ -62,8 +75,9 @@ class JobMatcherCrew:
             config=self.agents_config["job_scraper_agent"],  # type: ignore[index]
             tools=[],  # No tools needed - content is pre-scraped
             llm=llm,
-            verbose=True,
-            allow_delegation=False
+            verbose=CREW_VERBOSE,
+            allow_delegation=False,
+            max_retry_limit=0  # Failed calls (e.g. 429s) are retried with backoff by the flow
         )
     
     @agent
@@ -72,8 +86,9 @@ class JobMatcherCrew:
         return Agent(
             config=self.agents_config["job_matching_agent"],  # type: ignore[index]
             llm=llm,
-            verbose=True,
-            allow_delegation=False
+            verbose=CREW_VERBOSE,
+            allow_delegation=False,
+            max_retry_limit=0  # Failed calls (e.g. 429s) are retried with backoff by the flow
         )
     # To learn more about structured task outputs,
     # task dependencies, and task callbacks, check out the documentation:
@@ -92,6 +107,13 @@ class JobMatcherCrew:
             config=self.tasks_config["job_matching_task"],  # type: ignore[index]
         )
     
+    @task
+    def resume_optimization_task(self) -> Task:
+        """Task for generating resume optimization feedback for a scored match"""
+        return Task(
+            config=self.tasks_config["resume_optimization_task"],  # type: ignore[index]
+        )
+    
     @crew
     def crew(self) -> Crew:
         """Creates the Job Matcher Crew - DEPRECATED: Use scraper_crew() or matcher_crew() instead"""
@@ -99,7 +121,7 @@ class JobMatcherCrew:
             agents=self.agents,  # Automatically created by the @agent decorator
             tasks=self.tasks,  # Automatically created by the @task decorator
             process=Process.sequential,
-            verbose=True,
+            verbose=CREW_VERBOSE,
         )
     
     def scraper_crew(self) -> Crew:
@@ -108,16 +130,29 @@ class JobMatcherCrew:
             agents=[self.job_scraper_agent()],
             tasks=[self.job_scraper_task()],
             process=Process.sequential,
-            verbose=True,
+            verbose=CREW_VERBOSE,
         )
     
-    def matcher_crew(self) -> Crew:
-        """Creates a crew with only the matching agent and task"""
+    def matcher_crew(self, stream: bool = False) -> Crew:
+        """Creates a crew with only the matching agent and task
+
+        With stream=True the agent streams tokens (emitted as LLMStreamChunkEvent)
+        """
+        matching_agent = self.job_matching_agent()
+        if stream:
+            matching_agent.llm = streaming_llm
         return Crew(
-            agents=[self.job_matching_agent()],
+            agents=[matching_agent],
             tasks=[self.job_matching_task()],
             process=Process.sequential,
-            verbose=True,
+            verbose=CREW_VERBOSE,
         )
     
-
+    def optimization_crew(self) -> Crew:
+        """Creates a crew with only the matching agent and resume optimization task"""
+        return Crew(
+            agents=[self.job_matching_agent()],
+            tasks=[self.resume_optimization_task()],
+            process=Process.sequential,
+            verbose=CREW_VERBOSE,
+        )
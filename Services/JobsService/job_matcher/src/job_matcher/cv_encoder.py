@@ -0,0 +1,196 @@
+"""
+Compact CV rendering for prompts
+Turns parsed CV data into minified text without personal details, trimmed to a token
+budget by dropping the details least relevant to the job's skills
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from job_matcher.cache import LRUCache, content_hash
+from job_matcher.quota import estimate_tokens
+from job_matcher.skills import skill_matcher
+
+CV_PROMPT_TOKEN_BUDGET = int(os.getenv("CV_PROMPT_TOKEN_BUDGET", "1500"))
+CV_ENCODING_CACHE_SIZE = int(os.getenv("CV_ENCODING_CACHE_SIZE", "1024"))
+
+# Dropped wherever they appear: contact details and attributes that must not affect matching
+PERSONAL_FIELDS = {
+    "email", "phone", "phone_number", "mobile", "address", "linkedin", "github",
+    "website", "portfolio_url", "photo", "picture", "date_of_birth", "birth_date", "dob",
+    "age", "gender", "nationality", "marital_status",
+}
+# Dropped at the top level only ("name" of a project or certification is useful)
+PERSONAL_SECTIONS = {"personal_info", "contact", "contact_info", "name", "full_name", "references"}
+
+# Scalars longer than this inside a list entry are details rather than part of its header
+HEADER_MAX_CHARS = 80
+# Details are cut to this length before whole details are dropped
+DETAIL_MAX_CHARS = 300
+
+
+@dataclass(frozen=True)
+class CVLine:
+    """One rendered line; details may be trimmed or dropped to fit the budget"""
+    text: str
+    is_detail: bool
+    skills: FrozenSet[str]
+
+
+@dataclass
+class CVEncoding:
+    """CV text for a prompt and what the compaction saved"""
+    text: str
+    tokens: int
+    raw_tokens: int  # Estimate for the dict repr previously sent to the prompt
+    omitted: int  # Details dropped to fit the budget
+
+
+def _clean(value: Any) -> str:
+    return " ".join(str(value).split())
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _is_scalar(value: Any) -> bool:
+    return not isinstance(value, (dict, list, tuple))
+
+
+def _line(text: str, is_detail: bool = False) -> CVLine:
+    return CVLine(text, is_detail, frozenset(skill_matcher.extract(text)))
+
+
+def strip_personal_data(cv_data: Optional[Dict]) -> Optional[Dict]:
+    """Copy of the CV without PERSONAL_FIELDS (anywhere) and PERSONAL_SECTIONS (top level)"""
+    def strip(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: strip(item) for key, item in value.items() if key not in PERSONAL_FIELDS}
+        if isinstance(value, (list, tuple)):
+            return [strip(item) for item in value]
+        return value
+
+    if not isinstance(cv_data, dict):
+        return cv_data
+    return {key: strip(value) for key, value in cv_data.items() if key not in PERSONAL_SECTIONS | PERSONAL_FIELDS}
+
+
+def _render_entry(entry: Dict, indent: str, lines: List[CVLine]):
+    """Render a list entry (a job, degree, project...) as a header line plus detail lines"""
+    header, details = [], []
+    for key, value in entry.items():
+        if key in PERSONAL_FIELDS or _is_empty(value):
+            continue
+        if _is_scalar(value) and len(_clean(value)) <= HEADER_MAX_CHARS:
+            header.append(_clean(value))
+        elif _is_scalar(value):
+            details.append(_line(f"{indent}  {key}: {_clean(value)}", is_detail=True))
+        elif isinstance(value, (list, tuple)) and all(_is_scalar(item) for item in value):
+            # One line per bullet so each can be kept or dropped on its own
+            details.extend(
+                _line(f"{indent}  • {_clean(item)}", is_detail=True)
+                for item in value if not _is_empty(item)
+            )
+        else:
+            details.append(_line(f"{indent}  {key}: {_clean(_flatten(value))}", is_detail=True))
+    lines.append(_line(f"{indent}- {' | '.join(header)}" if header else f"{indent}-"))
+    lines.extend(details)
+
+
+def _flatten(value: Any) -> str:
+    """Deeply nested values are rare in CVs; render them inline"""
+    if isinstance(value, dict):
+        return "; ".join(
+            f"{key}: {_flatten(item)}" for key, item in value.items()
+            if key not in PERSONAL_FIELDS and not _is_empty(item)
+        )
+    if isinstance(value, (list, tuple)):
+        return ", ".join(_flatten(item) for item in value if not _is_empty(item))
+    return _clean(value)
+
+
+def _render(cv_data: Dict, indent: str = "") -> List[CVLine]:
+    lines: List[CVLine] = []
+    for key, value in cv_data.items():
+        if key in PERSONAL_FIELDS or _is_empty(value) or (not indent and key in PERSONAL_SECTIONS):
+            continue
+        if _is_scalar(value):
+            lines.append(_line(f"{indent}{key}: {_clean(value)}"))
+        elif isinstance(value, dict):
+            lines.append(_line(f"{indent}{key}:"))
+            lines.extend(_render(value, indent + "  "))
+        elif all(_is_scalar(item) for item in value):
+            lines.append(_line(f"{indent}{key}: {', '.join(_clean(item) for item in value if not _is_empty(item))}"))
+        else:
+            lines.append(_line(f"{indent}{key}:"))
+            for item in value:
+                if isinstance(item, dict):
+                    _render_entry(item, indent, lines)
+                elif not _is_empty(item):
+                    lines.append(_line(f"{indent}- {_flatten(item)}"))
+    return lines
+
+
+# CV content hash -> (rendered lines, raw token estimate); independent of the job
+_rendered_cvs = LRUCache(CV_ENCODING_CACHE_SIZE)
+
+
+def _rendered(cv_data: Dict):
+    key = content_hash(cv_data)
+    rendered = _rendered_cvs.get(key)
+    if rendered is None:
+        rendered = (_render(cv_data), estimate_tokens(cv_data))
+        _rendered_cvs.put(key, rendered)
+    return rendered
+
+
+def encode_cv(
+    cv_data: Optional[Dict],
+    job_skills: Optional[Dict[str, List[str]]] = None,
+    budget: int = CV_PROMPT_TOKEN_BUDGET
+) -> CVEncoding:
+    """
+    Render a CV for a prompt within a token budget
+
+    Headers (roles, degrees, skill lists, summary fields) are always kept. If the CV is
+    over budget, long details are trimmed first, then the details mentioning the fewest
+    of the job's skills are dropped, later (older) entries first.
+
+    Args:
+        cv_data: Parsed CV data
+        job_skills: Canonical {"required": [...], "preferred": [...]} skills of the job
+        budget: Max estimated tokens for the rendered CV
+    """
+    lines, raw_tokens = _rendered(cv_data or {})
+    texts = [line.text for line in lines]
+    total = estimate_tokens("\n".join(texts))
+
+    if total > budget:
+        for i, line in enumerate(lines):
+            if line.is_detail and len(line.text) > DETAIL_MAX_CHARS:
+                texts[i] = line.text[:DETAIL_MAX_CHARS].rstrip() + "…"
+        total = estimate_tokens("\n".join(texts))
+
+    omitted = 0
+    if total > budget:
+        required = set((job_skills or {}).get("required", []))
+        preferred = set((job_skills or {}).get("preferred", []))
+
+        def relevance(i: int):
+            skills = lines[i].skills
+            return (2 * len(skills & required) + len(skills & preferred), len(skills), -i)
+
+        for i in sorted((i for i, line in enumerate(lines) if line.is_detail), key=relevance):
+            if total <= budget:
+                break
+            total -= estimate_tokens(texts[i]) + 1
+            texts[i] = None
+            omitted += 1
+
+    kept = [text for text in texts if text is not None]
+    if omitted:
+        kept.append(f"({omitted} less relevant details omitted)")
+    text = "\n".join(kept)
+    return CVEncoding(text=text, tokens=estimate_tokens(text), raw_tokens=raw_tokens, omitted=omitted)
@@ -0,0 +1,231 @@
+"""
+Near-duplicate job posting detection
+SimHash fingerprints of scraped content and extracted descriptions, indexed by bands
+so reposts and cross-board copies can reuse the canonical posting's extraction and matches
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Max differing bits (out of 64) for two fingerprints to count as the same posting
+DEDUP_HAMMING_THRESHOLD = int(os.getenv("DEDUP_HAMMING_THRESHOLD", "8"))
+DEDUP_INDEX_SIZE = int(os.getenv("DEDUP_INDEX_SIZE", "10000"))
+
+FINGERPRINT_BITS = 64
+
+TRACKING_PARAMS = {
+    "from", "ref", "refid", "src", "source", "trk", "trackingid",
+    "gclid", "fbclid", "mc_cid", "mc_eid",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_URL_RE = re.compile(r"https?://\S+")
+
+
+def normalize_job_url(url: str) -> str:
+    """Drop tracking query parameters and fragments so reshared links compare equal"""
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ]
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip("/"),
+        urlencode(sorted(query)),
+        ""
+    ))
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(_URL_RE.sub(" ", text.lower()))
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """64-bit SimHash of word shingles; similar texts differ in few bits"""
+    tokens = _tokens(text)
+    if len(tokens) < shingle_size:
+        shingles = Counter(tokens)
+    else:
+        shingles = Counter(
+            " ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)
+        )
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, count in shingles.items():
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            if h >> bit & 1:
+                weights[bit] += count
+            else:
+                weights[bit] -= count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def title_company_key(scraped_job: Dict) -> str:
+    """
+    Normalized title|company|location key of an extracted job
+
+    The location is part of the key: the same role in another city usually has a
+    near-identical description but is a different posting.
+    """
+    title = " ".join(_tokens(str(scraped_job.get("title") or "")))
+    company = " ".join(_tokens(str(scraped_job.get("company") or "")))
+    location = " ".join(_tokens(str(scraped_job.get("location") or "")))
+    return f"{title}|{company}|{location}" if title and company else ""
+
+
+def description_fingerprint(scraped_job: Dict) -> Optional[int]:
+    """SimHash of the extracted description, or None if there is none"""
+    description = str(scraped_job.get("description") or "")
+    return simhash(description) if len(_tokens(description)) >= 20 else None
+
+
+@dataclass
+class CanonicalJob:
+    """A posting seen before, with its extraction and match results per CV hash"""
+    job_url: str
+    scraped_job: Dict
+    content_fp: int
+    description_fp: Optional[int]
+    title_key: str
+    match_results: Dict[str, Dict] = field(default_factory=dict)
+
+
+class JobFingerprintIndex:
+    """
+    In-memory near-duplicate index.
+
+    Each 64-bit fingerprint is split into threshold + 1 bands; two fingerprints within
+    the Hamming threshold must agree exactly on at least one band, so lookups only
+    compare against entries sharing a band instead of scanning the whole index.
+    """
+
+    def __init__(self, threshold: int = DEDUP_HAMMING_THRESHOLD, max_entries: int = DEDUP_INDEX_SIZE):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._band_count = threshold + 1
+        self._band_bits = -(-FINGERPRINT_BITS // self._band_count)
+        self._entries: "OrderedDict[str, CanonicalJob]" = OrderedDict()
+        self._bands: Dict[Tuple[str, int, int], List[CanonicalJob]] = {}
+        self._lock = threading.Lock()
+
+    def _band_keys(self, kind: str, fingerprint: int):
+        mask = (1 << self._band_bits) - 1
+        for band in range(self._band_count):
+            yield kind, band, fingerprint >> (band * self._band_bits) & mask
+
+    def _nearest(
+        self,
+        kind: str,
+        fingerprint: int,
+        accept: Callable[[CanonicalJob], bool]
+    ) -> Optional[CanonicalJob]:
+        """Closest accepted entry within the threshold (called with the lock held)"""
+        best, best_distance = None, self.threshold + 1
+        seen = set()
+        for key in self._band_keys(kind, fingerprint):
+            for entry in self._bands.get(key, []):
+                if id(entry) in seen:
+                    continue
+                seen.add(id(entry))
+                other = entry.content_fp if kind == "content" else entry.description_fp
+                distance = hamming_distance(fingerprint, other)
+                if distance < best_distance and accept(entry):
+                    best, best_distance = entry, distance
+        return best
+
+    def find_by_content(self, scraped_content: str) -> Optional[CanonicalJob]:
+        """Canonical posting whose scraped page is a near-duplicate of scraped_content"""
+        fingerprint = simhash(scraped_content)
+        text = " ".join(_tokens(scraped_content))
+
+        def mentions_title_company_and_location(entry: CanonicalJob) -> bool:
+            # Pages on the same board share a lot of boilerplate, so also require the
+            # canonical posting's title, company and location to appear on the page
+            title, company, location = (entry.title_key.split("|") + ["", ""])[:3]
+            return bool(title) and title in text and company in text and location in text
+
+        with self._lock:
+            entry = self._nearest("content", fingerprint, mentions_title_company_and_location)
+            if entry:
+                self._entries.move_to_end(entry.job_url)
+            return entry
+
+    def find_by_job(self, scraped_job: Dict) -> Optional[CanonicalJob]:
+        """Canonical posting with the same title/company/location and a near-duplicate description"""
+        title_key = title_company_key(scraped_job)
+        fingerprint = description_fingerprint(scraped_job)
+        if not title_key or fingerprint is None:
+            return None
+        with self._lock:
+            entry = self._nearest("description", fingerprint, lambda e: e.title_key == title_key)
+            if entry:
+                self._entries.move_to_end(entry.job_url)
+            return entry
+
+    def add(self, job_url: str, scraped_content: str, scraped_job: Dict) -> CanonicalJob:
+        """Register a newly extracted posting as canonical"""
+        entry = CanonicalJob(
+            job_url=normalize_job_url(job_url),
+            scraped_job=scraped_job,
+            content_fp=simhash(scraped_content),
+            description_fp=description_fingerprint(scraped_job),
+            title_key=title_company_key(scraped_job)
+        )
+        with self._lock:
+            if entry.job_url in self._entries:
+                self._remove(self._entries[entry.job_url])
+            self._entries[entry.job_url] = entry
+            for key in self._band_keys("content", entry.content_fp):
+                self._bands.setdefault(key, []).append(entry)
+            if entry.description_fp is not None:
+                for key in self._band_keys("description", entry.description_fp):
+                    self._bands.setdefault(key, []).append(entry)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries.values())))
+        return entry
+
+    def _remove(self, entry: CanonicalJob):
+        """Drop an entry from the index (called with the lock held)"""
+        self._entries.pop(entry.job_url, None)
+        keys = list(self._band_keys("content", entry.content_fp))
+        if entry.description_fp is not None:
+            keys += list(self._band_keys("description", entry.description_fp))
+        for key in keys:
+            bucket = self._bands.get(key)
+            if bucket:
+                bucket[:] = [other for other in bucket if other is not entry]
+                if not bucket:
+                    del self._bands[key]
+
+    def get_match(self, canonical_url: str, cv_hash: str) -> Optional[Dict]:
+        """Match result previously computed for this CV against the canonical posting"""
+        with self._lock:
+            entry = self._entries.get(canonical_url)
+            return entry.match_results.get(cv_hash) if entry else None
+
+    def record_match(self, canonical_url: str, cv_hash: str, match_result: Dict):
+        with self._lock:
+            entry = self._entries.get(canonical_url)
+            if entry:
+                entry.match_results[cv_hash] = match_result
+
+
+job_index = JobFingerprintIndex()
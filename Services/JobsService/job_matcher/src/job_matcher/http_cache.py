@@ -0,0 +1,156 @@
+"""
+Conditional requests and response body caching for the match result endpoints
+Results carry a version that changes on every update; it backs the ETag, and the
+serialized (and compressed) body of each version is cached so repeat reads are a copy
+"""
+
+import gzip
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from starlette.requests import Request
+
+from job_matcher.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # Optional: install the "compression" extra for br responses
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def parse_timestamp(value: str) -> datetime:
+    """UTC datetime of an ISO timestamp stored on a result (naive values are UTC)"""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def etag_for(version: int, updated_at: str) -> str:
+    """Weak ETag: the same version can be sent with different content encodings"""
+    return f'W/"{version}-{int(parse_timestamp(updated_at).timestamp())}"'
+
+
+def cache_headers(version: int, updated_at: str, status: str) -> Dict[str, str]:
+    """
+    Validators and caching policy for a result at this version
+
+    Last-Modified is only sent for finished results: it has one second resolution,
+    and a running result can change several times within a second.
+    """
+    headers = {
+        "ETag": etag_for(version, updated_at),
+        # Even finished results change (retry of a failed match, optimization added to a
+        # completed one): always revalidate, which is cheap with 304s
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if status in TERMINAL_STATUSES:
+        headers["Last-Modified"] = format_datetime(parse_timestamp(updated_at), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, updated_at: str, status: str) -> bool:
+    """
+    Whether the client's cached copy is current (If-None-Match wins over If-Modified-Since)
+
+    If-Modified-Since is ignored for running results, see cache_headers.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and status in TERMINAL_STATUSES:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one second resolution
+        return parse_timestamp(updated_at).replace(microsecond=0) <= since
+    return False
+
+
+def choose_encoding(request: Request) -> Optional[str]:
+    """Preferred supported content encoding accepted by the client, if any"""
+    accepted = {}
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, 0.0) > 0:
+            return encoding
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class ResponseBodyCache:
+    """
+    Serialized response bodies per (key, version), with their compressed variants.
+
+    Only one version is kept per key: a newer version replaces the older bodies.
+    """
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE):
+        self._entries = LRUCache(max_size)  # key -> (version, {encoding: body})
+
+    def body(
+        self,
+        key: Hashable,
+        version: int,
+        serialize: Callable[[], bytes],
+        encoding: Optional[str],
+        cache: bool = True
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        Body for this version in the requested encoding
+
+        Args:
+            key: Identifies the resource, e.g. ("match", request_id)
+            version: Version of the resource; bodies of other versions are not reused
+            serialize: Produces the uncompressed JSON body
+            encoding: Content encoding accepted by the client (from choose_encoding)
+            cache: Whether to keep the bodies for the next read
+
+        Returns:
+            Tuple of (body, content encoding actually applied or None)
+        """
+        entry = self._entries.get(key)
+        bodies: Dict[str, bytes] = entry[1] if entry and entry[0] == version else {}
+
+        if "identity" not in bodies:
+            bodies["identity"] = serialize()
+        identity = bodies["identity"]
+        if encoding is None or len(identity) < RESPONSE_COMPRESSION_MIN_BYTES:
+            encoding = None
+        elif encoding not in bodies:
+            bodies[encoding] = _compress(identity, encoding)
+
+        if cache:
+            self._entries.put(key, (version, bodies))
+        return bodies[encoding or "identity"], encoding
+
+
+response_cache = ResponseBodyCache()
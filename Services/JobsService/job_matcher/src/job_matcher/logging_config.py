@@ -0,0 +1,129 @@
+"""
+Logging setup for the service, the flow and the batch runner
+Records are handed to a background thread through a queue so the request path never
+blocks on stdout; production mode adds JSON output, quiet crews and payload sampling
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# development: readable text, verbose crews, every payload preview
+# production: JSON lines, quiet crews, sampled payload previews
+LOG_MODE = os.getenv("LOG_MODE", "development").lower()
+PRODUCTION = LOG_MODE == "production"
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json" if PRODUCTION else "text").lower()
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "false" if PRODUCTION else "true").lower() == "true"
+# Fraction of large payload logs (scraped pages, raw LLM output) that are emitted
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01" if PRODUCTION else "1"))
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "300"))
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Fields attached to every record logged inside log_context(), e.g. request_id
+_log_context: contextvars.ContextVar[dict] = contextvars.ContextVar("log_context", default={})
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current log_context() fields onto the record before it is queued"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the message, level, logger and any extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RESERVED_ATTRS})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging(stream=None):
+    """
+    Route all logging through a queue to a background writer thread (idempotent)
+
+    Args:
+        stream: Output stream, stdout by default
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+@contextmanager
+def log_context(**fields) -> Iterator[None]:
+    """Attach fields (e.g. request_id) to every record logged within the block"""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def log_payload(logger: logging.Logger, label: str, payload: str, level: int = logging.INFO):
+    """
+    Log a truncated preview of a large payload, for a sample of calls only
+
+    Args:
+        logger: Logger to emit on
+        label: What the payload is, e.g. "Scraped content"
+        payload: The full text; only LOG_PAYLOAD_MAX_CHARS are logged
+        level: Log level of the preview
+    """
+    if not logger.isEnabledFor(level) or random.random() >= LOG_PAYLOAD_SAMPLE_RATE:
+        return
+    logger.log(
+        level,
+        f"📄 {label}: {payload[:LOG_PAYLOAD_MAX_CHARS]}...",
+        extra={"payload_chars": len(payload)}
+    )
@@ -1,8 +1,7 @@
 #!/usr/bin/env python
 from random import randint
-from typing import Dict, List
-import json
-import re
+from typing import Any, Callable, Dict, List, Optional
+import logging
 import os
 
 from pydantic import BaseModel
@@ -10,6 +9,20 @@ from pydantic import BaseModel
 from crewai.flow import Flow, listen, start
 
 from job_matcher.crews.Job_Matcher.jobmatcher_crew import JobMatcherCrew
+from job_matcher.dedup import job_index, normalize_job_url
+from job_matcher.logging_config import configure_logging, log_payload
+from job_matcher.cache import content_hash, get_cache
+from job_matcher.checkpoint import checkpointed, get_checkpoint_store, input_hash
+from job_matcher.cv_encoder import encode_cv
+from job_matcher.optimization import generate_resume_optimization
+from job_matcher.parsing import parse_json_from_result
+from job_matcher.profiling import RequestProfile, timed_stage
+from job_matcher.quota import firecrawl_quota, llm_quota_timeout
+from job_matcher.scheduler import check_deadline
+from job_matcher.skills import extract_cv_skills, extract_job_skills, skill_gap
+from job_matcher.streaming import IncrementalJSONParser, stream_task_output
+
+logger = logging.getLogger(__name__)
 
 
 # Define the state model for the flow
@@ -21,51 +34,186 @@ class JobMatcherState(BaseModel):
     scraped_content: str = ""  # Add this to store raw scraped content
     scraped_job: Dict = {}
     match_result: Dict = {}
+    stream: bool = False  # Stream matching tokens and publish partial results
+    include_optimization: bool = False  # Generate resume optimization in the same run
+    deadline: float = 0.0  # Absolute epoch seconds, 0 for no deadline
+    canonical_job_url: str = ""  # Posting this job is a (near-)duplicate of, or itself
+    cv_skills: List[str] = []  # Canonical skills found in the CV
+    job_skills: Dict[str, List[str]] = {}  # Canonical required/preferred skills of the job
+    skill_gap: Dict[str, List[str]] = {}  # Job skills missing from the CV
+    checkpoint_id: str = ""  # Persist state after every stage under this id (empty: no checkpoints)
+    completed_stages: List[str] = []  # Stages already completed, skipped when resuming
 
 class JobMatcherFlow(Flow[JobMatcherState]):
 
+    def __init__(
+        self,
+        on_partial_result: Optional[Callable[[Dict], None]] = None,
+        profile: Optional[RequestProfile] = None,
+        **kwargs: Any
+    ):
+        """
+        Args:
+            on_partial_result: Called with the fields parsed so far each time the
+                streamed match result gains a new top-level field
+            profile: Collects stage timings (and samples/memory when profiling);
+                a timings-only profile is used if omitted
+        """
+        super().__init__(**kwargs)
+        self._on_partial_result = on_partial_result
+        self.profile = profile or RequestProfile()
+        self._trigger_payload: Dict = {}
+
     @start()
+    @timed_stage
     def initialize_with_cv_data(self, crewai_trigger_payload: dict = None):
         """
         Receives parsed CV data from Resume Parser microservice
         Stores it in state for later use by Job Matcher Agent
+        With a checkpoint_id, resumes from that run's checkpoint if one exists
         """
         if not crewai_trigger_payload:
             raise Exception("CV data required from Resume Parser service")
         
+        self._trigger_payload = crewai_trigger_payload
+        self.state.checkpoint_id = crewai_trigger_payload.get('checkpoint_id') or ''
+        restored = self._restore_checkpoint()
+        
         # Store CV data from external microservice
         self.state.cv_data = crewai_trigger_payload.get('cv_data')
         self.state.candidate_id = crewai_trigger_payload.get('candidate_id')
         self.state.job_url = crewai_trigger_payload.get('job_url', '')
+        self.state.stream = bool(crewai_trigger_payload.get('stream', False))
+        self.state.include_optimization = bool(crewai_trigger_payload.get('include_optimization', False))
+        self.state.deadline = float(crewai_trigger_payload.get('deadline') or 0.0)
+        
+        if restored:
+            return
         
         if not self.state.job_url:
             raise Exception("Job URL is required ")
         
-        print(f"✅ Initialized with CV data for candidate: {self.state.candidate_id}")
-        print(f"🔗 Job URL: {self.state.job_url}")  # ✅ This field exists in JobMatcherState
+        self.state.cv_skills = extract_cv_skills(self.state.cv_data)
+        
+        logger.info(f"✅ Initialized with CV data for candidate {self.state.candidate_id}, job URL: {self.state.job_url}")
+        self._save_checkpoint()
+    
+    def _restore_checkpoint(self) -> bool:
+        """Load the state saved by an earlier attempt of this run, if it is for the same inputs"""
+        if not self.state.checkpoint_id:
+            return False
+        checkpoint = get_checkpoint_store().load(self.state.checkpoint_id)
+        if not checkpoint or input_hash(checkpoint["payload"]) != input_hash(self._trigger_payload):
+            return False
+        
+        for key, value in checkpoint["state"].items():
+            if key != "id" and key in JobMatcherState.model_fields:
+                setattr(self.state, key, value)
+        logger.info(f"♻️  Resuming {self.state.checkpoint_id} after: {', '.join(self.state.completed_stages) or 'initialization'}")
+        return True
+    
+    def _save_checkpoint(self, status: str = "running", error: Optional[str] = None):
+        """Persist the current state (no-op without a checkpoint_id)"""
+        if not self.state.checkpoint_id:
+            return
+        get_checkpoint_store().save(
+            self.state.checkpoint_id,
+            self._trigger_payload,
+            self.state.model_dump(),
+            status=status,
+            error=error
+        )
+    
     @listen(initialize_with_cv_data)
+    @timed_stage
+    @checkpointed
     def scrape_jobs(self):
         """
         Pre-scrape job content using Firecrawl, then pass to agent for extraction
         """
-        print("\n" + "="*60)
-        print(f"� Pre-scraping job with Firecrawl: {self.state.job_url}")
-        print("="*60)
+        logger.info(f"🔍 Pre-scraping job with Firecrawl: {self.state.job_url}")
         
-        import time
+        # STEP 1: Pre-scrape with Firecrawl BEFORE calling the agent
+        scrape_cache = get_cache("scrape")
+        scrape_key = normalize_job_url(self.state.job_url)  # Tracking params don't change the page
+        cached_content = scrape_cache.get(scrape_key) if scrape_cache else None
+        if self.state.scraped_content:
+            logger.info("♻️  Using scrape from the checkpoint")
+        elif cached_content is not None:
+            logger.info("♻️  Using cached scrape")
+            self.state.scraped_content = cached_content
+        else:
+            with self.profile.stage("firecrawl"):
+                self.state.scraped_content = self._scrape_with_firecrawl()
+            if scrape_cache:
+                scrape_cache.put(scrape_key, self.state.scraped_content)
+            self._save_checkpoint()  # A failed extraction is retried without re-scraping
+        
+        # STEP 2: Now pass the pre-scraped content to agent for extraction
+        extraction_cache = get_cache("extraction")
+        extraction_key = content_hash(self.state.scraped_content)
+        cached_job = extraction_cache.get(extraction_key) if extraction_cache else None
+        if cached_job is not None:
+            logger.info("♻️  Using cached extraction")
+            self.state.scraped_job = cached_job
+        else:
+            duplicate = job_index.find_by_content(self.state.scraped_content)
+            if duplicate:
+                # Repost or tracking-param variant of a posting we already extracted
+                logger.info(f"♻️  Near-duplicate of {duplicate.job_url}, reusing its extraction")
+                self.state.canonical_job_url = duplicate.job_url
+                self.state.scraped_job = dict(duplicate.scraped_job, application_url=self.state.job_url)
+            else:
+                with self.profile.stage("extraction"):
+                    self.state.scraped_job = self._extract_job_details()
+                if extraction_cache and not self.state.scraped_job.get('parsing_failed'):
+                    extraction_cache.put(extraction_key, self.state.scraped_job)
+        
+        self._register_canonical_job()
+        
+        self.state.job_skills = extract_job_skills(self.state.scraped_job, self.state.scraped_content)
+        self.state.skill_gap = skill_gap(self.state.cv_skills, self.state.job_skills)
+        
+        if isinstance(self.state.scraped_job, dict):
+            logger.info(
+                f"✅ Extracted job: {self.state.scraped_job.get('title', 'Unknown')} "
+                f"at {self.state.scraped_job.get('company', 'Unknown')} "
+                f"({self.state.scraped_job.get('location', 'Unknown')})"
+            )
+        else:
+            logger.warning("⚠️  Could not parse job data as JSON")
+
+    def _register_canonical_job(self):
+        """Link this posting to its canonical copy in the duplicate index, or register it as canonical"""
+        if self.state.canonical_job_url or self.state.scraped_job.get('parsing_failed'):
+            return
+        
+        # Same title/company/location and near-identical description, e.g. the same job on another board
+        canonical = job_index.find_by_job(self.state.scraped_job)
+        if canonical:
+            logger.info(f"♻️  Same posting as {canonical.job_url}")
+        else:
+            canonical = job_index.add(self.state.job_url, self.state.scraped_content, self.state.scraped_job)
+        self.state.canonical_job_url = canonical.job_url
+
+    def _scrape_with_firecrawl(self) -> str:
+        """Scrape the job URL with Firecrawl and return the page content"""
         from crewai_tools import FirecrawlScrapeWebsiteTool
         
+        # Don't spend Firecrawl or LLM quota on work nobody is waiting for anymore
+        check_deadline(self.state.deadline, "scraping")
+        
         # Get Firecrawl API key
         firecrawl_api_key = os.environ.get("FIRECRAWL_API_KEY")
         if not firecrawl_api_key:
             raise ValueError("FIRECRAWL_API_KEY not found in environment")
         
-        # STEP 1: Pre-scrape with Firecrawl BEFORE calling the agent
-        print("📡 Calling Firecrawl API...")
+        logger.info("📡 Calling Firecrawl API...")
         scraper = FirecrawlScrapeWebsiteTool(api_key=firecrawl_api_key)
         
         try:
-            scraped_result = scraper._run(url=self.state.job_url)
+            with firecrawl_quota.acquire(timeout=self._quota_timeout()):
+                scraped_result = scraper._run(url=self.state.job_url)
             
             # Extract content from Document object
             if hasattr(scraped_result, 'page_content'):
@@ -77,128 +225,185 @@ class JobMatcherFlow(Flow[JobMatcherState]):
             else:
                 scraped_content = str(scraped_result)
             
-            self.state.scraped_content = scraped_content
-            print(f"✅ Scraped {len(scraped_content)} characters")
-            print(f"📄 Preview: {scraped_content[:300]}...")
+            logger.info(f"✅ Scraped {len(scraped_content)} characters")
+            log_payload(logger, "Scraped content", scraped_content)
             
-            # Check what was actually scraped
-            if "data scientist" in scraped_content.lower():
-                print("✅ Found 'data scientist' in scraped content")
-            elif "warehouse" in scraped_content.lower():
-                print("⚠️  WARNING: Found 'warehouse' - wrong job scraped!")
+            return scraped_content
             
         except Exception as e:
-            print(f"❌ Firecrawl scraping failed: {e}")
+            logger.error(f"❌ Firecrawl scraping failed: {e}")
             raise
+
+    def _extract_job_details(self) -> Dict:
+        """Run the extraction agent over the scraped content and parse its JSON"""
+        import time
         
-        # STEP 2: Now pass the pre-scraped content to agent for extraction
-        print("\n🤖 Sending scraped content to extraction agent...")
+        check_deadline(self.state.deadline, "extraction")
+        logger.info("🤖 Sending scraped content to extraction agent...")
         start_time = time.time()
         
-        result = (
-            JobMatcherCrew()
-            .scraper_crew()  # Use scraper_crew() instead of crew()
-            .kickoff(inputs={
-                "job_url": self.state.job_url,
-                "scraped_content": self.state.scraped_content,  # Pass pre-scraped content
-            })
-        )
+        with llm_quota_timeout(self._quota_timeout()):
+            result = (
+                JobMatcherCrew()
+                .scraper_crew()  # Use scraper_crew() instead of crew()
+                .kickoff(inputs={
+                    "job_url": self.state.job_url,
+                    "scraped_content": self.state.scraped_content,  # Pass pre-scraped content
+                })
+            )
         
         elapsed = time.time() - start_time
-        print(f"⏱️  Agent extraction took {elapsed:.2f} seconds")
+        logger.info(f"⏱️  Agent extraction took {elapsed:.2f} seconds")
         
         # Extract scraped job data and parse JSON
         raw_result = result.raw if hasattr(result, 'raw') else str(result)
         
         # Try to parse JSON from the result
-        self.state.scraped_job = self._parse_json_from_result(raw_result)
-        
-        if isinstance(self.state.scraped_job, dict):
-            print(f"✅ Extracted job: {self.state.scraped_job.get('title', 'Unknown')}")
-            print(f"🏢 Company: {self.state.scraped_job.get('company', 'Unknown')}")
-            print(f"📍 Location: {self.state.scraped_job.get('location', 'Unknown')}")
-        else:
-            print(f"⚠️  Warning: Could not parse job data as JSON")
-            print(f"Raw result preview: {str(raw_result)[:200]}...")
+        scraped_job = self._parse_json_from_result(raw_result)
+        if scraped_job.get('parsing_failed'):
+            log_payload(logger, "Raw extraction result", str(raw_result), level=logging.WARNING)
+        return scraped_job
 
     @listen(scrape_jobs)
+    @timed_stage
+    @checkpointed
     def match_jobs_and_optimize(self):
         """
-     Step 2: Match CV to job and generate resume optimization feedback
+     Step 2: Match CV to job and score the fit
+     Resume optimization feedback is a separate stage (optimize_resume)
 
         """
-        print("\n" + "="*60)
-        print("🎯 Analyzing CV-Job match and generating resume feedback...")
-        print("="*60)
+        logger.info("🎯 Analyzing CV-Job match...")
         
         import time
+        
+        # Drop fields streamed by a previous (failed) attempt
+        self._discard_partial_fields()
+        
+        cv_hash = content_hash(self.state.cv_data)
+        if self.state.canonical_job_url:
+            reused = job_index.get_match(self.state.canonical_job_url, cv_hash)
+            if reused is not None:
+                logger.info(f"♻️  Reusing match result for {self.state.canonical_job_url}")
+                self.state.match_result = dict(reused)
+                return self.state.match_result
+        
+        check_deadline(self.state.deadline, "matching")
         start_time = time.time()
         
-        result = (
-            JobMatcherCrew()
-            .matcher_crew()  # Use matcher_crew() instead of crew()
-            .kickoff(inputs={
-                "cv_data": self.state.cv_data,           
-                "scraped_job_details": self.state.scraped_job,  
-                "candidate_id": self.state.candidate_id
-            })
+        cv_prompt = encode_cv(self.state.cv_data, self.state.job_skills)
+        logger.info(
+            f"🗜️  CV prompt: ~{cv_prompt.tokens} tokens (raw ~{cv_prompt.raw_tokens}"
+            f"{f', {cv_prompt.omitted} details omitted' if cv_prompt.omitted else ''})"
         )
         
+        crew = JobMatcherCrew().matcher_crew(stream=self.state.stream)  # Use matcher_crew() instead of crew()
+        inputs = {
+            "cv_data": cv_prompt.text,
+            "scraped_job_details": self.state.scraped_job,
+            "candidate_id": self.state.candidate_id,
+            "cv_skills": ", ".join(self.state.cv_skills) or "none",
+            "job_required_skills": ", ".join(self.state.job_skills.get('required', [])) or "none",
+            "job_preferred_skills": ", ".join(self.state.job_skills.get('preferred', [])) or "none"
+        }
+        
+        with (
+            self.profile.stage("llm"),  # Includes waiting for LLM quota
+            llm_quota_timeout(self._quota_timeout())
+        ):
+            if self.state.stream:
+                # Publish score and breakdown while the reasoning is still being generated
+                parser = IncrementalJSONParser(
+                    on_field=self._publish_partial_field,
+                    on_reset=self._discard_partial_fields
+                )
+                with stream_task_output(str(crew.tasks[0].id), parser):
+                    result = crew.kickoff(inputs=inputs)
+            else:
+                result = crew.kickoff(inputs=inputs)
+        
         elapsed = time.time() - start_time
-        print(f"⏱️  Matching took {elapsed:.2f} seconds")
+        logger.info(f"⏱️  Matching took {elapsed:.2f} seconds")
         
         # Parse match result
         raw_result = result.raw if hasattr(result, 'raw') else str(result)
-        self.state.match_result = self._parse_json_from_result(raw_result)
+        with self.profile.stage("parse"):
+            self.state.match_result = self._parse_json_from_result(raw_result)
         
         if isinstance(self.state.match_result, dict):
             match_score = self.state.match_result.get('overall_match_score', 0)
-            print(f"✅ Match Score: {match_score}/100")
-            print(f"📝 Resume optimization feedback generated")
+            logger.info(f"✅ Match Score: {match_score}/100")
         else:
-            print(f"⚠️  Warning: Could not parse match result as JSON")
+            logger.warning("⚠️  Could not parse match result as JSON")
+        
+        if not self.state.match_result.get('parsing_failed'):
+            self.state.match_result['skill_gap'] = self.state.skill_gap
+        
+        if self.state.canonical_job_url and not self.state.match_result.get('parsing_failed'):
+            # Duplicates of this posting can reuse the result for the same CV
+            job_index.record_match(self.state.canonical_job_url, cv_hash, dict(self.state.match_result))
         
         return self.state.match_result
 
+    @listen(match_jobs_and_optimize)
+    @timed_stage
+    @checkpointed
+    def optimize_resume(self):
+        """
+     Step 3 (optional): Generate resume optimization feedback for the scored match
+     Skipped unless include_optimization was requested - clients can fetch it later on demand
+
+        """
+        if not self.state.include_optimization or self.state.match_result.get('parsing_failed'):
+            return self.state.match_result
+        
+        optimization, _ = generate_resume_optimization(
+            self.state.cv_data,
+            self.state.scraped_job,
+            self.state.match_result
+        )
+        if optimization.get('parsing_failed'):
+            # Left out so the on-demand endpoint generates it again
+            logger.warning("⚠️  Could not parse resume optimization as JSON")
+        else:
+            self.state.match_result['resume_optimization'] = optimization
+        return self.state.match_result
+
+    def _quota_timeout(self) -> Optional[float]:
+        """Max seconds to wait for provider quota: the time left until the deadline"""
+        if not self.state.deadline:
+            return None
+        import time
+        return max(0.0, self.state.deadline - time.time())
+
+    def _publish_partial_field(self, key: str, value: Any):
+        """Store a streamed top-level field and forward the partial result"""
+        self.state.match_result[key] = value
+        if key == 'overall_match_score':
+            logger.info(f"⚡ Early match score: {value}/100")
+        if self._on_partial_result:
+            self._on_partial_result(dict(self.state.match_result))
+
+    def _discard_partial_fields(self):
+        """Forget streamed fields of an abandoned answer and forward the emptied result"""
+        if not self.state.match_result:
+            return
+        self.state.match_result = {}
+        if self._on_partial_result:
+            self._on_partial_result({})
+
     def _parse_json_from_result(self, result: str) -> Dict:
         """
         Parse JSON from crew result string
         Handles various formats: markdown code blocks, plain JSON, etc.
         """
-        if isinstance(result, dict):
-            return result
-        
-        result_str = str(result)
-        
-        # Try to extract JSON from markdown code blocks
-        json_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
-        matches = re.findall(json_pattern, result_str, re.DOTALL)
-        
-        if matches:
-            try:
-                return json.loads(matches[0])
-            except json.JSONDecodeError:
-                pass
-        
-        # Try to find JSON object directly
-        try:
-            # Find the first { and last }
-            start = result_str.find('{')
-            end = result_str.rfind('}')
-            if start != -1 and end != -1:
-                json_str = result_str[start:end+1]
-                return json.loads(json_str)
-        except json.JSONDecodeError:
-            pass
-        
-        # If all parsing fails, return raw string wrapped in dict
-        print("⚠️  Could not parse JSON from result, returning raw string")
-        return {"raw_output": result_str, "parsing_failed": True}
+        return parse_json_from_result(result)
 
 def kickoff():
     """
     Run the flow with default/test data
     """
+    configure_logging()
     job_flow = JobMatcherFlow()
     job_flow.kickoff()
 
@@ -229,6 +434,7 @@ def run_with_trigger():
 
     # Create flow and kickoff with trigger payload
     # The @start() methods will automatically receive crewai_trigger_payload parameter
+    configure_logging()
     job_flow = JobMatcherFlow()
 
     try:
@@ -273,10 +479,12 @@ def test_with_dummy_data():
     test_payload = {
         "cv_data": dummy_cv,
         "candidate_id": "test_123",
+        "include_optimization": True,
         # Replace with a real job URL for testing
         "job_url": "https://www.indeed.com/viewjob?jk=2a4913120e775350&from=shareddesktop_copy"
     }
     
+    configure_logging()
     print("🧪 Testing JobMatcher Flow with specific job URL...")
     print("="*60)
     job_flow = JobMatcherFlow()
@@ -0,0 +1,82 @@
+"""
+On-demand resume optimization stage
+Generates resume tailoring feedback for an already scored match, cached per (CV, job)
+"""
+
+import logging
+import os
+import time
+from typing import Dict, Tuple
+
+from job_matcher.cache import LRUCache, content_hash
+from job_matcher.crews.Job_Matcher.jobmatcher_crew import JobMatcherCrew
+from job_matcher.cv_encoder import encode_cv
+from job_matcher.parsing import parse_json_from_result
+from job_matcher.skills import extract_cv_skills, extract_job_skills, skill_gap
+
+logger = logging.getLogger(__name__)
+
+
+OPTIMIZATION_CACHE_SIZE = int(os.getenv("OPTIMIZATION_CACHE_SIZE", "1024"))
+
+optimization_cache = LRUCache(OPTIMIZATION_CACHE_SIZE)  # (CV hash, job hash) -> optimization
+
+
+def generate_resume_optimization(cv_data: Dict, scraped_job: Dict, match_result: Dict) -> Tuple[Dict, bool]:
+    """
+    Generate resume optimization feedback for a scored CV-job match
+
+    Args:
+        cv_data: Candidate CV data
+        scraped_job: Structured job posting extracted by the scraper crew
+        match_result: Scoring output of the matching stage
+
+    Returns:
+        Tuple of (resume_optimization dict, whether it was served from cache)
+    """
+    job_skills = extract_job_skills(scraped_job)
+    gap = match_result.get("skill_gap") or skill_gap(extract_cv_skills(cv_data), job_skills)
+    keyword_gap = gap.get("required", []) + gap.get("preferred", [])
+
+    key = (content_hash(cv_data), content_hash(scraped_job))
+    cached = optimization_cache.get(key)
+    if cached is not None:
+        logger.info("♻️  Resume optimization served from cache")
+        return cached, True
+
+    logger.info("📝 Generating resume optimization feedback...")
+    start_time = time.time()
+    cv_prompt = encode_cv(cv_data, job_skills).text
+
+    result = (
+        JobMatcherCrew()
+        .optimization_crew()
+        .kickoff(inputs={
+            "cv_data": cv_prompt,
+            "scraped_job_details": scraped_job,
+            "matching_skills": match_result.get("matching_skills", []),
+            "missing_skills": match_result.get("missing_skills", []),
+            "keyword_gap": ", ".join(keyword_gap) or "none"
+        })
+    )
+
+    elapsed = time.time() - start_time
+    logger.info(f"⏱️  Resume optimization took {elapsed:.2f} seconds")
+
+    raw_result = result.raw if hasattr(result, 'raw') else str(result)
+    optimization = parse_json_from_result(raw_result)
+
+    if not optimization.get("parsing_failed"):
+        # The locally computed gap is exhaustive for known skills; the LLM adds the rest
+        known = {keyword.lower() for keyword in keyword_gap}
+        suggested = [
+            keyword for keyword in optimization.get("keywords_to_add") or []
+            if isinstance(keyword, str) and keyword.lower() not in known
+        ]
+        optimization["keywords_to_add"] = keyword_gap + suggested
+
+    # Don't cache failed parses so the next request can try again
+    if not optimization.get("parsing_failed"):
+        optimization_cache.put(key, optimization)
+
+    return optimization, False
@@ -0,0 +1,46 @@
+"""
+Helpers for turning crew output into Python data
+"""
+
+import json
+import logging
+import re
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+def parse_json_from_result(result: str) -> Dict:
+    """
+    Parse JSON from crew result string
+    Handles various formats: markdown code blocks, plain JSON, etc.
+    """
+    if isinstance(result, dict):
+        return result
+    
+    result_str = str(result)
+    
+    # Try to extract JSON from markdown code blocks
+    json_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
+    matches = re.findall(json_pattern, result_str, re.DOTALL)
+    
+    if matches:
+        try:
+            return json.loads(matches[0])
+        except json.JSONDecodeError:
+            pass
+    
+    # Try to find JSON object directly
+    try:
+        # Find the first { and last }
+        start = result_str.find('{')
+        end = result_str.rfind('}')
+        if start != -1 and end != -1:
+            json_str = result_str[start:end+1]
+            return json.loads(json_str)
+    except json.JSONDecodeError:
+        pass
+    
+    # If all parsing fails, return raw string wrapped in dict
+    logger.warning("⚠️  Could not parse JSON from result, returning raw string")
+    return {"raw_output": result_str, "parsing_failed": True}
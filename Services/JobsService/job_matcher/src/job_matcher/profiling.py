@@ -0,0 +1,249 @@
+"""
+Per-request profiling for JobMatcherFlow runs
+Every run records how long each stage took; an opt-in profile additionally samples the
+running thread's stacks (collapsed-stack output for flamegraphs) and snapshots
+tracemalloc after every stage to show which stages retain memory
+"""
+
+import functools
+import heapq
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Profiled runs slow down every concurrent match (process-wide tracemalloc), so profile
+# requests and the slowest-requests endpoint are only served when this is turned on
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+# Seconds between stack samples of a profiled run
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+# Snapshot allocations per stage in profiled runs (tracemalloc slows the run down)
+PROFILE_TRACE_MEMORY = os.getenv("PROFILE_TRACE_MEMORY", "true").lower() == "true"
+PROFILE_MEMORY_TOP = int(os.getenv("PROFILE_MEMORY_TOP", "10"))
+# Finished runs kept for the slowest-requests endpoint
+PROFILE_HISTORY_SIZE = int(os.getenv("PROFILE_HISTORY_SIZE", "500"))
+
+MAX_STACK_DEPTH = 256
+
+# Allocations made by the profiler itself (filtered after the diff: Snapshot.filter_traces is slow)
+_IGNORED_ALLOCATION_FILES = {tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>", "<unknown>"}
+
+# tracemalloc is process-wide: it runs while at least one profiled run needs it
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def _acquire_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread at a fixed interval from a background thread.
+
+    Wall-clock sampling: time spent waiting on Firecrawl or the LLM shows up as the
+    frames blocked in I/O, next to the time spent in crewai and our own parsing.
+    """
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{self.thread_id}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        """Collapsed stacks ("root;...;leaf count" per line), as read by flamegraph.pl and speedscope"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+def _memory_diff(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> Dict:
+    """Memory allocated during a stage and still held at its end, by source line"""
+    diff = [
+        stat for stat in after.compare_to(before, "lineno")
+        if stat.traceback[0].filename not in _IGNORED_ALLOCATION_FILES
+    ]
+    retained = [stat for stat in diff if stat.size_diff > 0]
+    return {
+        "retained_kb": round(sum(stat.size_diff for stat in diff) / 1024, 1),
+        "peak_kb": round(tracemalloc.get_traced_memory()[1] / 1024, 1),
+        "top": [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "retained_kb": round(stat.size_diff / 1024, 1),
+                "blocks": stat.count_diff
+            }
+            for stat in retained[:PROFILE_MEMORY_TOP]
+        ]
+    }
+
+
+class RequestProfile:
+    """
+    Stage timings of one flow run, and its sampled stacks and memory when profiled
+
+    Nested stages are recorded as "stage/step", e.g. "scrape_jobs/firecrawl". Memory
+    snapshots are taken for top-level stages only. tracemalloc and its peak are
+    process-wide, so runs executing concurrently show up in each other's numbers.
+    """
+
+    def __init__(self, sample: bool = False, trace_memory: bool = False):
+        self.sample = sample
+        self.trace_memory = trace_memory
+        self.stages: List[Dict] = []
+        self._path: List[str] = []
+        self._sampler: Optional[SamplingProfiler] = None
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    @property
+    def profiled(self) -> bool:
+        return self.sample or self.trace_memory
+
+    @contextmanager
+    def running(self) -> Iterator["RequestProfile"]:
+        """Time the whole run; must be entered on the thread that executes the flow"""
+        if self.sample:
+            self._sampler = SamplingProfiler(threading.get_ident())
+            self._sampler.start()
+        if self.trace_memory:
+            _acquire_tracemalloc()
+        self._started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self._finished = time.perf_counter()
+            if self._sampler:
+                self._sampler.stop()
+            if self.trace_memory:
+                _release_tracemalloc()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the duration (and, for top-level profiled stages, the retained memory) of a block"""
+        self._path.append(name)
+        entry = {"stage": "/".join(self._path), "seconds": None}
+        self.stages.append(entry)  # In start order, so steps follow their stage
+        snapshot = None
+        if self.trace_memory and len(self._path) == 1 and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            snapshot = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry["seconds"] = round(time.perf_counter() - start, 4)
+            if snapshot is not None and tracemalloc.is_tracing():
+                entry["memory"] = _memory_diff(snapshot, tracemalloc.take_snapshot())
+            self._path.pop()
+
+    @property
+    def total_seconds(self) -> float:
+        if self._started is not None:
+            return round((self._finished or time.perf_counter()) - self._started, 4)
+        return round(sum(entry["seconds"] or 0 for entry in self.stages if "/" not in entry["stage"]), 4)
+
+    def summary(self) -> Dict:
+        summary = {"total_seconds": self.total_seconds, "stages": self.stages, "profiled": self.profiled}
+        if self._sampler:
+            summary["samples"] = self._sampler.samples
+            summary["sample_interval_ms"] = self._sampler.interval * 1000
+        return summary
+
+    def collapsed_stacks(self) -> str:
+        return self._sampler.collapsed() if self._sampler else ""
+
+
+def timed_stage(method: Callable) -> Callable:
+    """
+    Record a flow stage in the flow's RequestProfile
+
+    Place it above @checkpointed so retries count towards the stage.
+    The flow must provide a `profile` attribute.
+    """
+    stage = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.profile.stage(stage):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class RequestTimings:
+    """Stage breakdowns of recently finished runs, for finding the slow ones"""
+
+    def __init__(self, size: int = PROFILE_HISTORY_SIZE):
+        self._entries: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, request_id: str, status: str, profile: RequestProfile):
+        entry = {
+            "request_id": request_id,
+            "status": status,
+            "finished_at": time.time(),
+            **profile.summary()
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+    def slowest(self, limit: int = 10) -> List[Dict]:
+        with self._lock:
+            entries = list(self._entries)
+        return heapq.nlargest(limit, entries, key=lambda entry: entry["total_seconds"])
+
+    def discard(self, request_id: str):
+        with self._lock:
+            kept = [entry for entry in self._entries if entry["request_id"] != request_id]
+            self._entries.clear()
+            self._entries.extend(kept)
+
+
+request_timings = RequestTimings()
@@ -0,0 +1,298 @@
+"""
+Shared quota management for external providers (Gemini, Firecrawl)
+Token buckets for requests/min and tokens/min plus AIMD adaptive concurrency
+"""
+
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaTimeout(Exception):
+    """Raised when quota could not be acquired within the allowed time"""
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Best-effort detection of provider rate limiting (HTTP 429 / RESOURCE_EXHAUSTED)"""
+    status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status_code == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "resource_exhausted" in message
+
+
+def estimate_tokens(*texts) -> int:
+    """Rough token estimate (~4 characters per token) used before the real usage is known"""
+    return sum(len(str(text)) for text in texts) // 4
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `per_minute` tokens per minute"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)"""
+        self._refill(now)
+        # Requests larger than the bucket are allowed once it is full
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self.rate
+
+    def consume(self, amount: float):
+        """Take tokens; the balance may go negative to account for underestimates"""
+        self._tokens -= amount
+
+    def refund(self, amount: float):
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    def drain(self):
+        """Empty the bucket, e.g. after the provider signalled rate limiting"""
+        self._tokens = min(self._tokens, 0.0)
+
+
+class ProviderQuota:
+    """
+    Requests/min and tokens/min budgets with AIMD-controlled concurrency for one provider.
+
+    The concurrency limit grows by ~1 per limit's worth of fast successful calls and is
+    halved on every rate-limit response, so throughput converges just under the
+    provider's real limit instead of oscillating through error storms.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        target_latency: float = 30.0
+    ):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.target_latency = target_latency
+        self.concurrency_limit = float(max_concurrency)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._window: Deque[Tuple[float, int]] = deque()  # (timestamp, tokens) of the last minute
+        self._latency_ewma: Optional[float] = None
+        self._throttled = 0
+        self._errors = 0
+        self._completed = 0
+
+    @contextmanager
+    def acquire(self, estimated_tokens: int = 0, timeout: Optional[float] = None) -> Iterator["QuotaLease"]:
+        """
+        Block until a request slot, request budget and token budget are available
+
+        Args:
+            estimated_tokens: Expected prompt + completion tokens for the call
+            timeout: Max seconds to wait, None to wait indefinitely
+
+        Raises:
+            QuotaTimeout: If the quota is not available within timeout
+        """
+        give_up_at = time.monotonic() + timeout if timeout is not None else None
+
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._in_flight >= int(self.concurrency_limit):
+                    wait = None  # Woken when a call finishes
+                else:
+                    wait = max(
+                        self.requests.wait_time(1, now),
+                        self.tokens.wait_time(estimated_tokens, now) if self.tokens else 0.0
+                    )
+                    if wait == 0.0:
+                        break
+
+                if give_up_at is not None:
+                    remaining = give_up_at - now
+                    if remaining <= 0:
+                        raise QuotaTimeout(f"Timed out waiting for {self.name} quota")
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+            self.requests.consume(1)
+            if self.tokens:
+                self.tokens.consume(estimated_tokens)
+            self._in_flight += 1
+
+        lease = QuotaLease(estimated_tokens)
+        started = time.monotonic()
+        try:
+            yield lease
+        except BaseException as e:
+            self._finish(lease, time.monotonic() - started, error=e)
+            raise
+        else:
+            self._finish(lease, time.monotonic() - started)
+
+    def _finish(self, lease: "QuotaLease", latency: float, error: Optional[BaseException] = None):
+        with self._cond:
+            self._in_flight -= 1
+            now = time.monotonic()
+            used = lease.actual_tokens if lease.actual_tokens is not None else lease.estimated_tokens
+            if self.tokens and lease.actual_tokens is not None:
+                # Reconcile the estimate with real usage
+                diff = lease.actual_tokens - lease.estimated_tokens
+                if diff > 0:
+                    self.tokens.consume(diff)
+                else:
+                    self.tokens.refund(-diff)
+            self._window.append((now, used))
+            self._trim_window(now)
+
+            if error is not None and is_rate_limit_error(error):
+                self._throttled += 1
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+                self.requests.drain()
+                logger.warning(
+                    f"⚠️  {self.name} rate limited, concurrency limit -> {int(self.concurrency_limit)}"
+                )
+            elif error is not None:
+                self._errors += 1
+            else:
+                self._completed += 1
+                self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+                if latency <= self.target_latency:
+                    self.concurrency_limit = min(
+                        self.max_concurrency,
+                        self.concurrency_limit + 1 / self.concurrency_limit
+                    )
+                else:
+                    # Slow responses are an early overload signal: back off gently
+                    self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * 0.9)
+
+            self._cond.notify_all()
+
+    def _trim_window(self, now: float):
+        """Forget calls older than a minute (called with the lock held)"""
+        while self._window and now - self._window[0][0] > 60:
+            self._window.popleft()
+
+    def metrics(self) -> Dict:
+        """Current utilization of the provider's budgets"""
+        with self._cond:
+            self._trim_window(time.monotonic())
+            requests_last_minute = len(self._window)
+            tokens_last_minute = sum(tokens for _, tokens in self._window)
+            rpm_limit = self.requests.per_minute
+            tpm_limit = self.tokens.per_minute if self.tokens else None
+            return {
+                "requests_per_minute_limit": rpm_limit,
+                "tokens_per_minute_limit": tpm_limit,
+                "requests_last_minute": requests_last_minute,
+                "tokens_last_minute": tokens_last_minute,
+                "request_utilization": round(requests_last_minute / rpm_limit, 3),
+                "token_utilization": round(tokens_last_minute / tpm_limit, 3) if tpm_limit else None,
+                "in_flight": self._in_flight,
+                "concurrency_limit": round(self.concurrency_limit, 2),
+                "avg_latency_seconds": round(self._latency_ewma, 3) if self._latency_ewma is not None else None,
+                "completed": self._completed,
+                "throttled": self._throttled,
+                "errors": self._errors
+            }
+
+
+class QuotaLease:
+    """Handle for an acquired call; set actual_tokens once the real usage is known"""
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens: Optional[int] = None
+
+
+llm_quota = ProviderQuota(
+    "gemini",
+    requests_per_minute=float(os.getenv("GEMINI_RPM", "60")),
+    tokens_per_minute=float(os.getenv("GEMINI_TPM", "1000000")),
+    max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+    target_latency=float(os.getenv("GEMINI_TARGET_LATENCY", "30"))
+)
+
+firecrawl_quota = ProviderQuota(
+    "firecrawl",
+    requests_per_minute=float(os.getenv("FIRECRAWL_RPM", "20")),
+    max_concurrency=int(os.getenv("FIRECRAWL_MAX_CONCURRENCY", "5")),
+    target_latency=float(os.getenv("FIRECRAWL_TARGET_LATENCY", "15"))
+)
+
+
+def quota_metrics() -> Dict:
+    """Utilization metrics for every managed provider"""
+    return {quota.name: quota.metrics() for quota in (llm_quota, firecrawl_quota)}
+
+
+# Monotonic time after which LLM calls in the current context stop waiting for quota
+_llm_give_up_at: ContextVar[Optional[float]] = ContextVar("llm_give_up_at", default=None)
+
+
+@contextmanager
+def llm_quota_timeout(timeout: Optional[float]) -> Iterator[None]:
+    """
+    Bound how long the LLM calls made inside the block wait for Gemini quota
+
+    Args:
+        timeout: Max seconds (shared by all calls in the block), None to wait indefinitely
+    """
+    token = _llm_give_up_at.set(time.monotonic() + timeout if timeout is not None else None)
+    try:
+        yield
+    finally:
+        _llm_give_up_at.reset(token)
+
+
+def limit_llm_calls(llm, expected_output_tokens: int = 1000):
+    """
+    Make every request of a crewai LLM acquire Gemini quota
+
+    Wraps the instance's call() so retries and re-prompts inside a crew run are each
+    counted, and rate-limit errors reach the AIMD controller. Usage is estimated from
+    the prompt and the response text: the LLM's own usage counters are shared by all
+    concurrent runs.
+
+    Args:
+        llm: crewai LLM instance, wrapped in place
+        expected_output_tokens: Completion budget added to the prompt estimate
+    """
+    call = llm.call
+
+    @functools.wraps(call)
+    def quota_limited_call(messages, *args, **kwargs):
+        give_up_at = _llm_give_up_at.get()
+        timeout = max(0.0, give_up_at - time.monotonic()) if give_up_at is not None else None
+        if isinstance(messages, str):
+            prompt_tokens = estimate_tokens(messages)
+        else:
+            prompt_tokens = estimate_tokens(*(message.get("content") or "" for message in messages))
+        with llm_quota.acquire(prompt_tokens + expected_output_tokens, timeout=timeout) as lease:
+            response = call(messages, *args, **kwargs)
+            lease.actual_tokens = prompt_tokens + estimate_tokens(response)
+            return response
+
+    llm.call = quota_limited_call
+    return llm
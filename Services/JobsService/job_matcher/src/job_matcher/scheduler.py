@@ -0,0 +1,219 @@
+"""
+Priority scheduler for job match work
+Runs queued matches on a fixed worker pool with priority lanes, deadlines and aging
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MATCH_WORKERS = int(os.getenv("MATCH_WORKERS", "4"))
+# Seconds of waiting that promote a job by one priority class (starvation prevention)
+MATCH_AGING_SECONDS = float(os.getenv("MATCH_AGING_SECONDS", "30"))
+# Workers only interactive jobs may use, so a bulk import never occupies the whole pool
+MATCH_INTERACTIVE_RESERVED = int(os.getenv("MATCH_INTERACTIVE_RESERVED", "1"))
+
+
+class Priority(str, Enum):
+    """Priority classes, highest first"""
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+    BACKGROUND = "background"
+
+
+LANE_ORDER: List[Priority] = [Priority.INTERACTIVE, Priority.BATCH, Priority.BACKGROUND]
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work runs past its deadline"""
+
+
+def check_deadline(deadline: Optional[float], stage: str):
+    """
+    Raise DeadlineExceeded if the absolute deadline (epoch seconds) has passed
+
+    Args:
+        deadline: Absolute deadline, or None/0 for no deadline
+        stage: Name of the stage about to start, used in the error message
+    """
+    if deadline and time.time() > deadline:
+        raise DeadlineExceeded(f"Deadline exceeded before {stage}")
+
+
+@dataclass
+class ScheduledJob:
+    """A unit of work waiting in a priority lane"""
+    func: Callable[..., Any]
+    args: Tuple = ()
+    kwargs: Dict = field(default_factory=dict)
+    priority: Priority = Priority.INTERACTIVE
+    deadline: Optional[float] = None  # Absolute epoch seconds
+    on_expired: Optional[Callable[[], None]] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    def expired(self) -> bool:
+        return bool(self.deadline) and time.time() > self.deadline
+
+
+class MatchScheduler:
+    """
+    Worker pool with one FIFO lane per priority class.
+
+    The next job is the lane head with the lowest `rank * aging_seconds - waited`,
+    so higher classes win until a lower class has waited `aging_seconds` per class
+    of difference. Batch and background jobs together run on at most
+    `workers - interactive_reserved` workers, so an interactive job never waits for
+    a running bulk match. Jobs past their deadline are dropped before they run.
+    """
+
+    def __init__(
+        self,
+        workers: int = MATCH_WORKERS,
+        aging_seconds: float = MATCH_AGING_SECONDS,
+        interactive_reserved: int = MATCH_INTERACTIVE_RESERVED
+    ):
+        self.workers = workers
+        self.aging_seconds = aging_seconds
+        # At least one worker stays available to batch/background work
+        self.interactive_reserved = max(0, min(interactive_reserved, workers - 1))
+        self._lanes: Dict[Priority, Deque[ScheduledJob]] = {p: deque() for p in LANE_ORDER}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._running = 0
+        self._running_bulk = 0  # Running batch/background jobs
+        self._completed = 0
+        self._expired = 0
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        priority: Priority = Priority.INTERACTIVE,
+        deadline: Optional[float] = None,
+        on_expired: Optional[Callable[[], None]] = None,
+        **kwargs: Any
+    ):
+        """
+        Queue func(*args, **kwargs) in the lane for priority
+
+        Args:
+            priority: Priority class of the job
+            deadline: Absolute epoch seconds after which the job is dropped unrun
+            on_expired: Called instead of func when the job is dropped
+        """
+        job = ScheduledJob(
+            func=func,
+            args=args,
+            kwargs=kwargs,
+            priority=Priority(priority),
+            deadline=deadline,
+            on_expired=on_expired
+        )
+        with self._cond:
+            self._ensure_workers()
+            self._lanes[job.priority].append(job)
+            self._cond.notify()
+
+    def stats(self) -> Dict:
+        """Queue depths and counters for monitoring"""
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "interactive_reserved": self.interactive_reserved,
+                "running": self._running,
+                "running_bulk": self._running_bulk,
+                "completed": self._completed,
+                "expired": self._expired,
+                "queued": {p.value: len(lane) for p, lane in self._lanes.items()}
+            }
+
+    def _ensure_workers(self):
+        """Start the worker threads on first use (called with the lock held)"""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"match-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _pop_next(self) -> Tuple[Optional[ScheduledJob], List[ScheduledJob]]:
+        """
+        Pick the next job to run (called with the lock held)
+
+        Returns:
+            Tuple of (job to run or None, expired jobs removed from lane heads)
+        """
+        expired = []
+        now = time.monotonic()
+        best_lane = None
+        best_score = None
+        bulk_allowed = self._running_bulk < self.workers - self.interactive_reserved
+
+        for rank, priority in enumerate(LANE_ORDER):
+            lane = self._lanes[priority]
+            while lane and lane[0].expired():
+                expired.append(lane.popleft())
+            if not lane or (priority != Priority.INTERACTIVE and not bulk_allowed):
+                continue
+            score = rank * self.aging_seconds - (now - lane[0].enqueued_at)
+            if best_score is None or score < best_score:
+                best_lane, best_score = lane, score
+
+        return (best_lane.popleft() if best_lane else None), expired
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job, expired = self._pop_next()
+                while job is None and not expired:
+                    self._cond.wait()
+                    job, expired = self._pop_next()
+                self._expired += len(expired)
+                if job is not None:
+                    self._running += 1
+                    if job.priority != Priority.INTERACTIVE:
+                        self._running_bulk += 1
+
+            for dropped in expired:
+                self._expire(dropped)
+
+            if job is None:
+                continue
+
+            ran = False
+            try:
+                if job.expired():
+                    self._expire(job)
+                else:
+                    ran = True
+                    job.func(*job.args, **job.kwargs)
+            except Exception as e:
+                logger.error(f"❌ Scheduled job {job.func.__name__} failed: {e}")
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    if job.priority != Priority.INTERACTIVE:
+                        self._running_bulk -= 1
+                        self._cond.notify()  # A bulk job held back by the cap may run now
+                    if ran:
+                        self._completed += 1
+                    else:
+                        self._expired += 1
+
+    def _expire(self, job: ScheduledJob):
+        logger.warning(f"⏰ Dropping expired {job.priority.value} job {job.func.__name__}")
+        if job.on_expired:
+            try:
+                job.on_expired()
+            except Exception as e:
+                logger.error(f"❌ on_expired callback failed: {e}")
+
+
+match_scheduler = MatchScheduler()
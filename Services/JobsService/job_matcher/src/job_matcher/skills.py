@@ -0,0 +1,286 @@
+"""
+Built-in skill taxonomy and fast skill extraction
+Aliases are compiled into an Aho-Corasick automaton so canonical skills are found
+in a single linear pass over job postings and CVs
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Canonical skill -> aliases (matched case-insensitively on word boundaries).
+# Only aliases are matched; aliases that are also common words ("go", "express", "r")
+# are in SKILL_LIST_ALIASES instead.
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    # Languages
+    "Python": ["python", "python3"],
+    "Java": ["java"],
+    "JavaScript": ["javascript", "js", "ecmascript", "es6"],
+    "TypeScript": ["typescript"],
+    "Go": ["golang"],
+    "Rust": ["rustlang", "rust-lang"],
+    "C": ["c programming", "ansi c"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp"],
+    "Objective-C": ["objective-c", "objective c"],
+    "R": ["r programming", "rstudio"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swiftui"],
+    "Scala": ["scala"],
+    "Ruby": ["ruby"],
+    "PHP": ["php"],
+    "SQL": ["sql"],
+    "Bash": ["bash", "shell scripting"],
+    # Backend frameworks
+    "FastAPI": ["fastapi", "fast api"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "Spring Boot": ["spring boot", "springboot", "spring framework"],
+    "Node.js": ["node.js", "nodejs", "node js"],
+    "Express": ["express.js", "expressjs"],
+    ".NET": [".net", "dotnet", "asp.net"],
+    "Ruby on Rails": ["ruby on rails"],
+    "GraphQL": ["graphql"],
+    "REST APIs": ["rest api", "rest apis", "restful", "restful api", "restful apis"],
+    "gRPC": ["grpc"],
+    "Microservices": ["microservices", "microservice", "micro-services"],
+    # Frontend
+    "React": ["react", "react.js", "reactjs"],
+    "Angular": ["angular", "angularjs"],
+    "Vue.js": ["vue", "vue.js", "vuejs"],
+    "Next.js": ["next.js", "nextjs"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+    "Tailwind CSS": ["tailwind", "tailwindcss", "tailwind css"],
+    # Data stores
+    "PostgreSQL": ["postgresql", "postgres", "psql"],
+    "MySQL": ["mysql"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Elasticsearch": ["elasticsearch", "elastic search", "opensearch"],
+    "Cassandra": ["cassandra"],
+    "DynamoDB": ["dynamodb"],
+    "SQLite": ["sqlite"],
+    "Oracle Database": ["oracle db", "oracle database", "pl/sql"],
+    # Cloud & infrastructure
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure", "microsoft azure"],
+    "GCP": ["gcp", "google cloud", "google cloud platform"],
+    "Docker": ["docker", "containerization"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "Ansible": ["ansible"],
+    "Helm": ["helm chart", "helm charts"],
+    "Linux": ["linux", "unix"],
+    "Nginx": ["nginx"],
+    "Serverless": ["serverless", "aws lambda", "lambda functions"],
+    # Delivery
+    "CI/CD": ["ci/cd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Jenkins": ["jenkins"],
+    "GitHub Actions": ["github actions"],
+    "GitLab CI": ["gitlab ci", "gitlab-ci"],
+    "Git": ["git"],
+    "Agile": ["agile", "scrum"],
+    "Test-Driven Development": ["tdd", "test-driven development", "test driven development"],
+    # Messaging & data engineering
+    "Kafka": ["kafka", "apache kafka"],
+    "RabbitMQ": ["rabbitmq"],
+    "Spark": ["apache spark", "pyspark", "spark streaming"],
+    "Airflow": ["airflow", "apache airflow"],
+    "Hadoop": ["hadoop"],
+    "dbt": ["dbt"],
+    "ETL": ["etl", "elt", "data pipelines", "data pipeline"],
+    # Data science & ML
+    "Machine Learning": ["machine learning"],
+    "Deep Learning": ["deep learning"],
+    "NLP": ["nlp", "natural language processing"],
+    "Computer Vision": ["computer vision"],
+    "LLMs": ["llm", "llms", "large language models", "large language model"],
+    "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch"],
+    "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "Statistics": ["statistics", "statistical analysis"],
+    "Data Visualization": ["data visualization", "data visualisation", "tableau", "power bi"],
+    # Observability & security
+    "Prometheus": ["prometheus"],
+    "Grafana": ["grafana"],
+    "OAuth": ["oauth", "oauth2", "openid connect", "oidc"],
+    "Keycloak": ["keycloak"],
+    # Mobile
+    "Android": ["android"],
+    "iOS": ["ios"],
+    "React Native": ["react native"],
+    "Flutter": ["flutter"],
+}
+
+# Aliases that are also everyday words ("take the helm", "swift-growing", "spark ideas"):
+# matched only in skill lists (a CV's skills, a job's required/preferred skills), not prose
+SKILL_LIST_ALIASES: Dict[str, List[str]] = {
+    "Go": ["go"],
+    "Express": ["express"],
+    "R": ["r"],
+    "C": ["c"],
+    "TypeScript": ["ts"],
+    "Rust": ["rust"],
+    "Swift": ["swift"],
+    "Ruby on Rails": ["rails"],
+    "Docker": ["containers"],
+    "Helm": ["helm"],
+    "Agile": ["kanban"],
+    "Spark": ["spark"],
+    "Machine Learning": ["ml"],
+}
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over lower-cased skill aliases.
+
+    extract() walks the text once; matches are kept only when they start and end on
+    word boundaries, so "java" does not match inside "javascript".
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]  # (alias length, canonical)
+
+        for canonical, aliases in taxonomy.items():
+            for alias in set(aliases):
+                self._add(alias.lower(), canonical)
+        self._build_fail_links()
+
+    def _add(self, alias: str, canonical: str):
+        state = 0
+        for ch in alias:
+            if ch not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][ch] = len(self._goto) - 1
+            state = self._goto[state][ch]
+        self._output[state].append((len(alias), canonical))
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical skills mentioned in text, in order of first appearance"""
+        text = " ".join(text.lower().split())
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []  # (start, end, canonical)
+        state = 0
+        length = len(text)
+
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            if end + 1 < length and _is_word_char(text[end + 1]) and _is_word_char(ch):
+                continue
+            for alias_length, canonical in output[state]:
+                start = end - alias_length + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                matches.append((start, end, canonical))
+
+        # Drop matches inside a longer one ("js" in "node.js", "react" in "react native")
+        matches.sort(key=lambda m: (m[0], -m[1]))
+        found: Dict[str, None] = {}
+        covered_until = -1
+        for start, end, canonical in matches:
+            if end <= covered_until:
+                continue
+            covered_until = end
+            found.setdefault(canonical, None)
+        return list(found)
+
+
+skill_matcher = SkillMatcher(SKILL_TAXONOMY)
+skill_list_matcher = SkillMatcher({
+    skill: aliases + SKILL_LIST_ALIASES.get(skill, []) for skill, aliases in SKILL_TAXONOMY.items()
+})
+
+
+def _flatten_text(value: Any, skip_keys: Iterable[str] = ()) -> Iterable[str]:
+    """Yield every string nested in dicts/lists, skipping the given top-level keys"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in skip_keys:
+                continue
+            yield from _flatten_text(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _flatten_text(item)
+    elif value is not None:
+        yield str(value)
+
+
+def _merge(*skill_lists: List[str]) -> List[str]:
+    return list(dict.fromkeys(skill for skills in skill_lists for skill in skills))
+
+
+def extract_skills(text: str) -> List[str]:
+    """Canonical skills mentioned in raw text"""
+    return skill_matcher.extract(text)
+
+
+def extract_list_skills(value: Any) -> List[str]:
+    """Canonical skills in a skill list (also matches SKILL_LIST_ALIASES)"""
+    return skill_list_matcher.extract("\n".join(_flatten_text(value)))
+
+
+def extract_cv_skills(cv_data: Optional[Dict]) -> List[str]:
+    """Canonical skills mentioned anywhere in the CV (personal info excluded)"""
+    cv_data = cv_data or {}
+    return _merge(
+        extract_list_skills(cv_data.get("skills")),
+        skill_matcher.extract("\n".join(_flatten_text(cv_data, skip_keys=("personal_info", "skills"))))
+    )
+
+
+def extract_job_skills(scraped_job: Dict, scraped_content: str = "") -> Dict[str, List[str]]:
+    """
+    Canonical required and preferred skills of a job posting
+
+    Uses the extracted skill and requirement fields; the description only fills in the
+    required skills when those fields are empty, and never overrides a preferred skill.
+    Falls back to the raw scraped content when extraction failed.
+    """
+    if scraped_job.get("parsing_failed") or not scraped_job:
+        return {"required": skill_matcher.extract(scraped_content), "preferred": []}
+
+    required_text = "\n".join(_flatten_text([scraped_job.get("requirements"), scraped_job.get("qualifications")]))
+    required = _merge(extract_list_skills(scraped_job.get("required_skills")), skill_matcher.extract(required_text))
+    preferred = [skill for skill in extract_list_skills(scraped_job.get("preferred_skills")) if skill not in required]
+    if not required:
+        required = [
+            skill for skill in skill_matcher.extract("\n".join(_flatten_text(scraped_job.get("description"))))
+            if skill not in preferred
+        ]
+    return {"required": required, "preferred": preferred}
+
+
+def skill_gap(cv_skills: List[str], job_skills: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Job skills missing from the CV, by importance"""
+    have = set(cv_skills)
+    return {
+        "required": [skill for skill in job_skills.get("required", []) if skill not in have],
+        "preferred": [skill for skill in job_skills.get("preferred", []) if skill not in have],
+    }
@@ -0,0 +1,153 @@
+"""
+Incremental parsing of streamed LLM output
+Publishes top-level JSON fields as soon as the LLM has finished writing them
+"""
+
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from crewai.events import crewai_event_bus
+from crewai.events.types.llm_events import LLMStreamChunkEvent
+
+# ReAct-style agents write their reasoning before this marker and the answer after it
+FINAL_ANSWER_MARKER = "final answer:"
+
+
+class IncrementalJSONParser:
+    """
+    Parses a JSON object fed in arbitrary chunks and reports each top-level
+    field as soon as its value is complete.
+
+    Text before the first '{' (markdown fences) is ignored. A "Final Answer:" marker
+    restarts parsing after it, discarding braces in the agent's preceding thoughts, and
+    a new object after a finished one (crewai re-prompting after a format error) starts
+    over as well. on_reset is called when such a restart discards fields that were
+    already reported.
+    """
+
+    def __init__(self, on_field: Callable[[str, Any], None], on_reset: Optional[Callable[[], None]] = None):
+        self._on_field = on_field
+        self._on_reset = on_reset
+        self._tail = ""  # Last characters seen, to find the marker across chunks
+        self.fields: Dict[str, Any] = {}
+        self._reset(after_marker=False)
+
+    def _reset(self, after_marker: bool):
+        if self.fields and self._on_reset:
+            self._on_reset()
+        self.fields = {}
+        self._member: list = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._done = False
+        self._after_marker = after_marker
+
+    @property
+    def done(self) -> bool:
+        """True once the closing brace of the top-level object was seen"""
+        return self._done
+
+    def feed(self, chunk: str):
+        """Consume the next chunk of streamed text"""
+        for ch in chunk:
+            self._tail = (self._tail + ch.lower())[-len(FINAL_ANSWER_MARKER):]
+            # The marker inside a string value of the final answer is just text
+            if self._tail == FINAL_ANSWER_MARKER and not (self._after_marker and self._in_string and not self._done):
+                self._reset(after_marker=True)
+                continue
+
+            if self._done:
+                if ch != "{":
+                    continue
+                self._reset(after_marker=self._after_marker)
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._member.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._flush_member()
+                    self._done = True
+                    continue
+            elif ch == "," and self._depth == 1:
+                self._flush_member()
+                continue
+
+            self._member.append(ch)
+
+    def _flush_member(self):
+        """Parse the buffered `"key": value` pair and publish it"""
+        member = "".join(self._member).strip()
+        self._member = []
+        if not member:
+            return
+
+        try:
+            parsed = json.loads("{" + member + "}")
+        except json.JSONDecodeError:
+            # Malformed members are left to the final full-result parse
+            return
+
+        for key, value in parsed.items():
+            self.fields[key] = value
+            self._on_field(key, value)
+
+
+# Parsers for tasks currently streaming, keyed by crewAI task id
+_active_parsers: Dict[str, IncrementalJSONParser] = {}
+_lock = threading.Lock()
+_handler_registered = False
+
+
+def _on_stream_chunk(source: Any, event: LLMStreamChunkEvent):
+    """Route a streamed chunk to the parser registered for its task"""
+    parser = _active_parsers.get(getattr(event, "task_id", None))
+    if parser is not None and event.chunk:
+        parser.feed(event.chunk)
+
+
+@contextmanager
+def stream_task_output(task_id: str, parser: IncrementalJSONParser) -> Iterator[IncrementalJSONParser]:
+    """
+    Feed every LLM chunk emitted for task_id into parser while the context is open
+
+    Args:
+        task_id: Id of the crewAI task whose output should be parsed
+        parser: Parser receiving the chunks
+    """
+    global _handler_registered
+
+    with _lock:
+        if not _handler_registered:
+            # Stream chunk events are dispatched synchronously, so chunks arrive in order
+            crewai_event_bus.on(LLMStreamChunkEvent)(_on_stream_chunk)
+            _handler_registered = True
+        _active_parsers[task_id] = parser
+
+    try:
+        yield parser
+    finally:
+        with _lock:
+            _active_parsers.pop(task_id, None)
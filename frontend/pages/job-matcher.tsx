@@ -186,6 +186,9 @@ export default function JobMatcherPage() {
           setMatchResult(match_result);
           setIsLoading(false);
           console.log('✅ Job matching completed successfully!');
+          
+          // Resume optimization is generated on demand, after the score is shown
+          fetchResumeOptimization(reqId, match_result);
         } else if (status === 'failed') {
           // Failed - show error
           setError(apiError || 'Job matching failed. Please try again.');
@@ -215,6 +218,17 @@ export default function JobMatcherPage() {
     poll();
   };
 
+  const fetchResumeOptimization = async (reqId: string, matchData: any) => {
+    try {
+      const response = await axios.post(
+        `${process.env.NEXT_PUBLIC_JOB_MATCHER_URL || 'http://localhost:8010'}/api/v1/jobs/match/${reqId}/optimization`
+      );
+      setMatchResult({ ...matchData, resume_optimization: response.data.resume_optimization });
+    } catch (err: any) {
+      console.error('Resume optimization error:', err);
+    }
+  };
+
   const handleReset = () => {
     setJobUrl('');
     setResumeFile(null);